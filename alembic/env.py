@@ -10,6 +10,12 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app.db.init_db import Base  # Ajuste o caminho conforme seu projeto
 from app.models.user import User  # Onde seu modelo User está definido
+from app.models.client import Client
+from app.models.product import Product, ProductImage
+from app.models.order import Order, OrderItem
+from app.models.notification import NotificationOutbox
+from app.models.broadcast import BroadcastJob, BroadcastRecipient
+from app.models.sales_rollup import SalesRollup
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,76 @@
+"""add broadcast jobs
+
+Revision ID: 3f9a1c7d2e64
+Revises: b7e2c4d91a08
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7d2e64'
+down_revision: Union[str, None] = 'b7e2c4d91a08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables created by init_db / create_all already exist
+    if sa.inspect(op.get_bind()).has_table("broadcast_jobs"):
+        return
+
+    op.create_table(
+        "broadcast_jobs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("section", sa.String(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "RUNNING", "COMPLETED", name="broadcaststatus"),
+            nullable=False,
+        ),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("sent", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_by", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_broadcast_jobs_status_available_at", "broadcast_jobs", ["status", "available_at"]
+    )
+    op.create_table(
+        "broadcast_recipients",
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("client_id", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "SENT", "FAILED", name="recipientstatus"),
+            nullable=False,
+        ),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["broadcast_jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_id", "client_id"),
+    )
+    op.create_index(
+        "ix_broadcast_recipients_job_id_status", "broadcast_recipients", ["job_id", "status"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_broadcast_recipients_job_id_status", table_name="broadcast_recipients")
+    op.drop_table("broadcast_recipients")
+    op.drop_index("ix_broadcast_jobs_status_available_at", table_name="broadcast_jobs")
+    op.drop_table("broadcast_jobs")
+    sa.Enum(name="recipientstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="broadcaststatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,37 @@
+"""add keyset pagination indexes
+
+Revision ID: 45e07aa3aa1f
+Revises: 4de56cea3f94
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '45e07aa3aa1f'
+down_revision: Union[str, None] = '4de56cea3f94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_orders_created_at_id", "orders", ["created_at", "id"]),
+    ("ix_products_created_at_id", "products", ["created_at", "id"]),
+    ("ix_clients_created_by_created_at_id", "clients", ["created_by", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        # Tables created by init_db / create_all already have the index
+        if name not in {ix["name"] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
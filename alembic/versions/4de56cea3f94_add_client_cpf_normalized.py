@@ -0,0 +1,71 @@
+"""add client cpf_normalized
+
+Revision ID: 4de56cea3f94
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4de56cea3f94'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+clients = sa.table(
+    "clients",
+    sa.column("id", sa.String),
+    sa.column("cpf", sa.String),
+    sa.column("cpf_normalized", sa.String),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Tables created by init_db / create_all already have the column
+    if "cpf_normalized" in {c["name"] for c in inspector.get_columns("clients")}:
+        return
+
+    op.add_column("clients", sa.Column("cpf_normalized", sa.String(), nullable=True))
+
+    # Backfill the digits-only CPF for existing rows
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE clients SET cpf_normalized = regexp_replace(cpf, '[^0-9]', '', 'g')"
+        )
+    else:
+        rows = bind.execute(sa.select(clients.c.id, clients.c.cpf)).all()
+        for client_id, cpf in rows:
+            bind.execute(
+                clients.update()
+                .where(clients.c.id == client_id)
+                .values(cpf_normalized="".join(filter(str.isdigit, cpf)))
+            )
+
+    # The same CPF stored with different formatting would break the unique index
+    duplicates = bind.execute(
+        sa.select(clients.c.cpf_normalized)
+        .group_by(clients.c.cpf_normalized)
+        .having(sa.func.count() > 1)
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"Duplicate CPFs must be merged before this migration: {', '.join(duplicates)}"
+        )
+
+    with op.batch_alter_table("clients") as batch_op:
+        batch_op.alter_column("cpf_normalized", existing_type=sa.String(), nullable=False)
+    op.create_index("ix_clients_cpf_normalized", "clients", ["cpf_normalized"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clients_cpf_normalized", table_name="clients")
+    with op.batch_alter_table("clients") as batch_op:
+        batch_op.drop_column("cpf_normalized")
@@ -0,0 +1,60 @@
+"""add sales rollups
+
+Revision ID: 8c1d5e2f7a90
+Revises: 3f9a1c7d2e64
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1d5e2f7a90'
+down_revision: Union[str, None] = '3f9a1c7d2e64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_STATUSES = ("PENDING", "CONFIRMED", "PROCESSING", "SHIPPED", "DELIVERED", "CANCELLED")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Tables created by init_db / create_all already exist
+    if sa.inspect(bind).has_table("sales_rollups"):
+        return
+
+    op.create_table(
+        "sales_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("section", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(*ORDER_STATUSES, name="orderstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "section", "status"),
+    )
+
+    # Backfill from existing orders (same result as rebuild_sales_rollups.py)
+    if bind.dialect.name == "postgresql":
+        day = "(orders.created_at AT TIME ZONE 'UTC')::date"
+    else:
+        day = "date(orders.created_at)"
+    op.execute(f"""
+        INSERT INTO sales_rollups (day, section, status, order_count, total_amount)
+        SELECT {day}, products.section, orders.status,
+               COUNT(DISTINCT orders.id), SUM(order_items.total_price)
+        FROM orders
+        JOIN order_items ON order_items.order_id = orders.id
+        JOIN products ON products.id = order_items.product_id
+        GROUP BY {day}, products.section, orders.status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("sales_rollups")
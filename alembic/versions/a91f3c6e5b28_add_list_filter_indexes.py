@@ -0,0 +1,56 @@
+"""add list filter indexes
+
+Revision ID: a91f3c6e5b28
+Revises: d2b8e6a4c1f7
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91f3c6e5b28'
+down_revision: Union[str, None] = 'd2b8e6a4c1f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_orders_status_created_at_id", "orders", ["status", "created_at", "id"]),
+    ("ix_orders_client_id_created_at_id", "orders", ["client_id", "created_at", "id"]),
+    ("ix_order_items_order_id", "order_items", ["order_id"]),
+    ("ix_order_items_product_id_order_id", "order_items", ["product_id", "order_id"]),
+    ("ix_products_section_price", "products", ["section", "price"]),
+    ("ix_products_price", "products", ["price"]),
+    ("ix_product_images_product_id", "product_images", ["product_id"]),
+]
+
+# Covered by ix_products_section_price
+REPLACED = ("ix_products_section", "products", ["section"])
+
+
+def existing_indexes(table: str) -> set:
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    # Built without locking writes on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            # Tables created by init_db / create_all already have the index
+            if name not in existing_indexes(table):
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+
+        name, table, _ = REPLACED
+        if name in existing_indexes(table):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        name, table, columns = REPLACED
+        op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
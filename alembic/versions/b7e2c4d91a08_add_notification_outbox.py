@@ -0,0 +1,63 @@
+"""add notification outbox
+
+Revision ID: b7e2c4d91a08
+Revises: 45e07aa3aa1f
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4d91a08'
+down_revision: Union[str, None] = '45e07aa3aa1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables created by init_db / create_all already have the outbox
+    if sa.inspect(op.get_bind()).has_table("notification_outbox"):
+        return
+
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum("ORDER_CREATED", "ORDER_STATUS_CHANGED", name="notificationkind"),
+            nullable=False,
+        ),
+        sa.Column("order_id", sa.String(), nullable=False),
+        sa.Column(
+            "order_status",
+            sa.Enum(
+                "PENDING", "CONFIRMED", "PROCESSING", "SHIPPED", "DELIVERED", "CANCELLED",
+                name="orderstatus", create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("status", sa.Enum("PENDING", "SENT", "FAILED", name="outboxstatus"), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_outbox_status_available_at",
+        "notification_outbox",
+        ["status", "available_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notification_outbox_status_available_at", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
+    sa.Enum(name="outboxstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="notificationkind").drop(op.get_bind(), checkfirst=True)
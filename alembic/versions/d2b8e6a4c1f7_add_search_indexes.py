@@ -0,0 +1,46 @@
+"""add search indexes
+
+Revision ID: d2b8e6a4c1f7
+Revises: 8c1d5e2f7a90
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b8e6a4c1f7'
+down_revision: Union[str, None] = '8c1d5e2f7a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.db.search, or the planner will not use the indexes
+INDEXES = [
+    ("ix_products_description_fts", "products", "USING gin (to_tsvector('portuguese', description))"),
+    ("ix_products_description_trgm", "products", "USING gin (description gin_trgm_ops)"),
+    ("ix_clients_name_trgm", "clients", "USING gin (name gin_trgm_ops)"),
+    ("ix_clients_email_trgm", "clients", "USING gin (email gin_trgm_ops)"),
+]
+
+
+def upgrade() -> None:
+    # Search falls back to ILIKE on other databases
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built without locking writes; IF NOT EXISTS skips tables made by create_all
+    with op.get_context().autocommit_block():
+        for name, table, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
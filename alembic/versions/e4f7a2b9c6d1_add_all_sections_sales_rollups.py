@@ -0,0 +1,40 @@
+"""add all-sections sales rollups
+
+Revision ID: e4f7a2b9c6d1
+Revises: a91f3c6e5b28
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4f7a2b9c6d1'
+down_revision: Union[str, None] = 'a91f3c6e5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per day and status across sections (section ''), each order
+    # counted once; same result as rebuild_sales_rollups.py
+    if op.get_bind().dialect.name == "postgresql":
+        day = "(orders.created_at AT TIME ZONE 'UTC')::date"
+    else:
+        day = "date(orders.created_at)"
+    op.execute("DELETE FROM sales_rollups WHERE section = ''")
+    op.execute(f"""
+        INSERT INTO sales_rollups (day, section, status, order_count, total_amount)
+        SELECT {day}, '', orders.status, COUNT(*), SUM(items.total)
+        FROM orders
+        JOIN (
+            SELECT order_id, SUM(total_price) AS total FROM order_items GROUP BY order_id
+        ) AS items ON items.order_id = orders.id
+        GROUP BY {day}, orders.status
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM sales_rollups WHERE section = ''")
@@ -1,19 +1,287 @@
-from typing import Generator
-from sqlalchemy import create_engine
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Generator, Iterator, Optional
+from uuid import uuid4
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import collectors, db_pool_checkout_wait
+from app.db.replicas import ReplicaSet
 
-# Create database engine
-engine = create_engine(settings.DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """
+    Translate a sync database URL into the equivalent async driver URL
+    """
+    url_obj = make_url(url)
+    backend = url_obj.get_backend_name()
+    if url_obj.get_driver_name() in ("asyncpg", "aiosqlite") or backend not in ASYNC_DRIVERS:
+        return url
+    return url_obj.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+@dataclass
+class QueryStats:
+    """SQL sent while handling one request: statement count, time and repeats."""
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int = None) -> dict:
+        """Statements sent at least `threshold` times, the usual sign of an N+1 loop."""
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return {statement: n for statement, n in self.statements.items() if n >= threshold}
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect QueryStats for every statement sent in this context, including
+    from threadpool workers and the async engine's greenlets.
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+def redact_parameters(parameters) -> str:
+    """Parameter types only; values may hold passwords, CPFs or phone numbers."""
+    if isinstance(parameters, list):
+        return f"<{len(parameters)} rows>"
+    values = parameters.values() if isinstance(parameters, dict) else parameters or ()
+    return "(" + ", ".join(type(value).__name__ for value in values) + ")"
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_start = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_start
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        stats.statements[statement] += 1
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s parameters=%s", elapsed * 1000, statement, redact_parameters(parameters)
+        )
+
+def instrument_engine(sync_engine) -> None:
+    """Count, time and slow-log every statement the engine sends."""
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware tracking the SQL sent by each request. Repeated
+    statements are logged as suspected N+1 queries; in DEBUG mode the
+    query count and DB time are also returned as X-DB-* headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start" and settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append((b"x-db-time-ms", f"{stats.duration * 1000:.1f}".encode()))
+                    headers.append((b"x-db-repeated-statements", str(len(stats.repeated())).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        for statement, n in stats.repeated().items():
+            logger.warning("Possible N+1: %s %s sent %d times: %s", scope["method"], scope["path"], n, statement)
+
+def engine_options(url: str, statement_timeout_ms: int = 0) -> dict:
+    """
+    Pool sizing, connection health and timeout options for a PostgreSQL
+    engine, from Settings. SQLite keeps SQLAlchemy's default pool.
+    """
+    url_obj = make_url(url)
+    if url_obj.get_backend_name() != "postgresql":
+        return {}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    asyncpg = url_obj.get_driver_name() == "asyncpg"
+    if settings.DB_PGBOUNCER:
+        # In transaction pooling mode consecutive transactions may run on
+        # different server connections, so asyncpg must not cache prepared
+        # statements, and the unnamed ones it still uses need unique names.
+        # PgBouncer also rejects startup parameters such as statement_timeout;
+        # set it on the database role instead.
+        if asyncpg:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+    elif statement_timeout_ms:
+        # Enforced by the server, so a runaway query is cancelled even if the worker is stuck
+        timeout = str(statement_timeout_ms)
+        options["connect_args"] = (
+            {"server_settings": {"statement_timeout": timeout}} if asyncpg
+            else {"options": f"-c statement_timeout={timeout}"}
+        )
+    return options
+
+def pool_status(pool) -> dict:
+    """
+    Connections in use against the pool's capacity. Saturation is None for
+    pools without a fixed limit (SQLite, or unlimited overflow).
+    """
+    if not isinstance(pool, QueuePool) or pool._max_overflow < 0:
+        return {"checked_out": None, "capacity": None, "saturation": None}
+    capacity = pool.size() + pool._max_overflow
+    return {
+        "checked_out": pool.checkedout(),
+        "capacity": capacity,
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else 1.0,
+    }
+
+# Create database engine (scripts, migrations and init_db). Scripts run
+# long aggregations, so only the API engine gets a statement timeout.
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine)
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default PostgreSQL async pool, recording how long each checkout
+    waits for a free connection.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - start)
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+
+# Create async database engine used by the API endpoints
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **engine_options(ASYNC_DATABASE_URL, settings.DB_STATEMENT_TIMEOUT_MS),
+    **({"poolclass": TimedAsyncQueuePool} if make_url(ASYNC_DATABASE_URL).get_backend_name() == "postgresql" else {}),
+)
+
+def pool_metrics():
+    """Connections checked out of and idle in the API pool."""
+    pool = async_engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        yield "db_pool_connections", "gauge", "Connections in the API database pool", [
+            ("db_pool_connections", {"state": "checked_out"}, pool.checkedout()),
+            ("db_pool_connections", {"state": "idle"}, pool.checkedin()),
+        ]
+
+collectors.append(pool_metrics)
+instrument_engine(async_engine.sync_engine)
+
+def replica_engine(url: str) -> AsyncEngine:
+    """
+    Async engine for a read replica. Options are chosen for the async
+    driver, as for the primary.
+    """
+    async_url = get_async_database_url(url)
+    return create_async_engine(async_url, **engine_options(async_url, settings.DB_STATEMENT_TIMEOUT_MS))
+
+# Read replicas for GET requests; empty unless DATABASE_REPLICA_URLS is set
+replicas = ReplicaSet(
+    [replica_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+    check_interval=settings.REPLICA_CHECK_INTERVAL_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+)
+for replica in replicas.engines:
+    instrument_engine(replica.sync_engine)
+
+# Users who committed a write recently; their reads stay on the primary.
+# Per process, like the other caches.
+recent_writers = TTLCache(
+    "recent_writers", maxsize=settings.REPLICA_RECENT_WRITERS_SIZE, ttl=settings.REPLICA_READ_YOUR_WRITES_SECONDS
+)
+
+class RoutingSession(Session):
+    """
+    Session for API requests. A read-only session (GET and HEAD) reads
+    from one healthy replica for its whole life, unless its user wrote
+    within the read-your-writes window; every other session uses the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("read_only") and replicas:
+            if "replica" not in self.info:
+                user_id = self.info.get("user_id")
+                recent = user_id is not None and recent_writers.get(user_id) is not None
+                self.info["replica"] = None if recent else replicas.choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"].sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+def use_primary(db: AsyncSession) -> None:
+    """
+    Send the rest of this session's reads to the primary, e.g. to fill a
+    response cache that every user is served from.
+    """
+    db.info["read_only"] = False
+
+@event.listens_for(RoutingSession, "after_commit")
+def remember_writer(session):
+    # Recorded at commit, before the response is sent, so the user's next read sees it
+    if session.info.get("user_id") is not None:
+        recent_writers.set(session.info["user_id"], True)
+
+# Create async sessionmaker. Objects stay loaded after commit so handlers can
+# return them without triggering a lazy refresh outside the event loop.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False, sync_session_class=RoutingSession
+)
+
 # Create base class for models
 Base = declarative_base()
 
+@event.listens_for(Base.metadata, "before_create")
+def create_extensions(target, connection, **kw):
+    # Trigram search indexes need pg_trgm
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function that yields db sessions
@@ -22,4 +290,14 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+READ_ONLY_METHODS = {"GET", "HEAD"}
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function that yields async db sessions; GET and HEAD
+    requests may read from a replica
+    """
+    async with AsyncSessionLocal(info={"read_only": request.method in READ_ONLY_METHODS}) as db:
+        yield db
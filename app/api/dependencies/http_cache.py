@@ -0,0 +1,22 @@
+from fastapi import Request, Response, status
+
+from app.core.cache import CachedResponse
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check, with the weak comparison RFC 9110 asks for."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """
+    The cached JSON body with its ETag, or 304 Not Modified when the client
+    already has it
+    """
+    headers = {"ETag": entry.etag}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
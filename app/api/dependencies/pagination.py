@@ -0,0 +1,62 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import String, Select, tuple_, type_coerce
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """
+    Build the opaque cursor pointing just after the given row
+    """
+    raw = json.dumps([created_at.isoformat(sep=" "), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+def order_by_keyset(query: Select, model: Any) -> Select:
+    """
+    Apply the stable (created_at, id) ordering used by every list endpoint
+    """
+    return query.order_by(model.created_at, model.id)
+
+def keyset_query(query: Select, model: Any, cursor: str, limit: int, dialect: str) -> Select:
+    """
+    Restrict a filtered query to the page after the cursor.
+    An empty cursor selects the first page. One extra row is fetched to
+    know whether there is a next page.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if dialect == "sqlite":
+            # SQLite stores CURRENT_TIMESTAMP as text without fractional
+            # seconds; compare against the same text form
+            created_at = type_coerce(created_at.isoformat(sep=" "), String)
+        query = query.filter(tuple_(model.created_at, model.id) > tuple_(created_at, row_id))
+
+    return order_by_keyset(query, model).limit(limit + 1)
+
+def keyset_page(rows: List[Any], limit: int) -> dict:
+    """
+    Build the page response from the rows fetched by keyset_query
+    """
+    items = list(rows[:limit])
+    next_cursor: Optional[str] = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,17 +1,19 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Form
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.user import UserUpdate, UserInDB
 from app.models.user import User
 
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_async_db
 from app.core.config import settings
 from app.core.security import (
     create_access_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     get_current_user,
+    principal_cache,
 )
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, Token
@@ -24,12 +26,15 @@ router = APIRouter()
 
 @router.post("/login")
 async def login(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     email: str = Form(...),
     password: str = Form(...)
 ):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = await db.scalar(select(User).filter(User.email == email))
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_password_async(password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email or password incorrect",
@@ -39,6 +44,10 @@ async def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inative User",
         )
+    # Upgrade hashes made with an outdated scheme or cost
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(user.id)}, expires_delta=access_token_expires
@@ -46,26 +55,26 @@ async def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=UserSchema)
-async def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user
     """
     # Check if user with the given email already exists
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await db.scalar(select(User).filter(User.email == user_in.email))
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
     # Check if user with the given username already exists
-    user = db.query(User).filter(User.username == user_in.username).first()
+    user = await db.scalar(select(User).filter(User.username == user_in.username))
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken",
         )
     # Create new user
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     db_user = User(
         email=user_in.email,
         username=user_in.username,
@@ -75,8 +84,8 @@ async def register(user_in: UserCreate, db: Session = Depends(get_db)):
         is_admin=user_in.is_admin,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/refresh-token", response_model=Token)
@@ -98,16 +107,16 @@ async def refresh_token(current_user: User = Depends(get_current_user)):
 @router.put("/users/me")
 async def update_user(
     user_update: UserUpdate,  # aqui UserUpdate, não UserCreate
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    db_user = db.query(User).filter(User.id == current_user.id).first()
+    db_user = await db.scalar(select(User).filter(User.id == current_user.id))
 
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
     if user_update.password:
-        db_user.hashed_password = get_password_hash(user_update.password)
+        db_user.hashed_password = await get_password_hash_async(user_update.password)
     if user_update.email is not None:
         db_user.email = user_update.email
     if user_update.username is not None:
@@ -119,8 +128,10 @@ async def update_user(
     if user_update.is_admin is not None:
         db_user.is_admin = user_update.is_admin
 
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    # Privilege and active-state changes must apply to the next request
+    principal_cache.invalidate(db_user.id)
 
     return db_user
 
@@ -128,12 +139,13 @@ async def update_user(
 # Delete user
 @router.delete("/users/me", status_code=204)
 async def delete_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_user = db.query(User).filter(User.id == current_user.id).first()
+    db_user = await db.scalar(select(User).filter(User.id == current_user.id))
     if not db_user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+    principal_cache.invalidate(db_user.id)
     return None  # status code 204 don't return the content
\ No newline at end of file
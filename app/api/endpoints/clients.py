@@ -1,68 +1,128 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_async_db
+from app.api.dependencies.pagination import keyset_page, keyset_query, order_by_keyset
+from app.db.search import fuzzy_search
 from app.core.security import get_current_active_user, get_current_admin_user
-from app.models.client import Client
+from app.core.serialization import dumps
+from app.models.client import Client, normalize_cpf
 from app.models.user import User
-from app.schemas.client import ClientCreate, ClientUpdate, Client as ClientSchema
+from app.schemas.client import ClientCreate, ClientUpdate, Client as ClientSchema, ClientPage
+from app.services.bulk import detect_format, iter_file, iter_records, spool_body
+from app.services.client_import import ClientImporter
+from app.services.export import export_response
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ClientSchema])
+def filter_clients(query, current_user: User, name: Optional[str] = None, email: Optional[str] = None):
+    """
+    Apply the client list filters to a query
+    """
+    query = query.filter(Client.created_by == current_user.id)
+    
+    # Apply filters if provided
+    if name:
+        query = query.filter(Client.name.ilike(f"%{name}%"))
+    if email:
+        query = query.filter(Client.email.ilike(f"%{email}%"))
+    
+    return query
+
+@router.get("/", response_model=Union[List[ClientSchema], ClientPage])
 async def read_clients(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
     skip: int = 0,
     limit: int = 100,
     name: Optional[str] = None,
     email: Optional[str] = None,
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from next_cursor; send it empty for the first page"
+    ),
+    q: Optional[str] = Query(
+        None, min_length=2, description="Search name and email, tolerating typos; most relevant first"
+    ),
 ):
     """
-    Retrieve clients with pagination and filtering options
+    Retrieve clients with pagination and filtering options.
+    When cursor is given, returns a page with items and next_cursor instead of a list.
+    When q is given, returns the best matches first, paginated with skip and limit.
     """
-    query = db.query(Client).filter(Client.created_by == current_user.id)
+    query = filter_clients(select(Client), current_user, name, email)
     
-    # Apply filters if provided
-    if name:
-        query = query.filter(Client.name.ilike(f"%{name}%"))
-    if email:
-        query = query.filter(Client.email.ilike(f"%{email}%"))
+    # Search mode: relevance order, served by the trigram indexes
+    if q is not None:
+        q = q.strip()
+        if not q:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Search query is empty",
+            )
+        if cursor is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search results are paginated with skip and limit, not cursor",
+            )
+        condition, rank = fuzzy_search(db.get_bind().dialect.name, [Client.name, Client.email], q)
+        query = query.filter(condition).order_by(rank.desc(), Client.created_at, Client.id)
+        return (await db.scalars(query.offset(skip).limit(limit))).all()
+    
+    # Keyset pagination: cost does not grow with the page number
+    if cursor is not None:
+        clients = (await db.scalars(keyset_query(query, Client, cursor, limit, db.get_bind().dialect.name))).all()
+        return keyset_page(clients, limit)
     
     # Get paginated results
-    clients = query.offset(skip).limit(limit).all()
+    clients = (await db.scalars(order_by_keyset(query, Client).offset(skip).limit(limit))).all()
     
     return clients
 
+@router.get("/export")
+async def export_clients(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+):
+    """
+    Stream every client matching the list filters as NDJSON or CSV
+    """
+    query = filter_clients(select(*Client.__table__.columns), current_user, name, email)
+    
+    return export_response(db, order_by_keyset(query, Client), format, "clients")
+
 @router.post("/", response_model=ClientSchema, status_code=status.HTTP_201_CREATED)
 async def create_client(
     client_in: ClientCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Create a new client
     """
-    # Check if client with this email already exists
-    if db.query(Client).filter(Client.email == client_in.email).first():
+    # Check email and CPF uniqueness with a single indexed lookup
+    cpf_normalized = normalize_cpf(client_in.cpf)
+    duplicates = (await db.execute(
+        select(Client.email, Client.cpf_normalized)
+        .filter(or_(Client.email == client_in.email, Client.cpf_normalized == cpf_normalized))
+        .limit(2)
+    )).all()
+    
+    if any(row.email == client_in.email for row in duplicates):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    
-    # Check if client with this CPF already exists
-    # First, remove formatting from CPF to compare correctly
-    cpf_digits = ''.join(filter(str.isdigit, client_in.cpf))
-    existing_clients = db.query(Client).all()
-    
-    for existing_client in existing_clients:
-        existing_cpf_digits = ''.join(filter(str.isdigit, existing_client.cpf))
-        if existing_cpf_digits == cpf_digits:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="CPF already registered",
-            )
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CPF already registered",
+        )
     
     # Create new client
     db_client = Client(
@@ -79,21 +139,50 @@ async def create_client(
     )
     
     db.add(db_client)
-    db.commit()
-    db.refresh(db_client)
+    await db.commit()
+    await db.refresh(db_client)
     
     return db_client
 
+@router.post("/import")
+async def import_clients(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults to the Content-Type"),
+    errors_only: bool = Query(False, description="Leave created rows out of the report"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Import clients from a CSV (with a header row) or NDJSON body. Rows are
+    validated like POST /clients, deduplicated by CPF and email against the
+    file and the database, and inserted in batches. The response is NDJSON:
+    one result per row, then a summary line.
+    """
+    fmt = detect_format(request.headers.get("content-type"), format)
+    body = await spool_body(request)
+    importer = ClientImporter(db, current_user.id)
+    
+    async def report():
+        try:
+            async for result in importer.run(iter_records(iter_file(body), fmt)):
+                if not (errors_only and result["status"] == "created"):
+                    yield dumps(result) + b"\n"
+            yield dumps({"summary": importer.report.totals()}) + b"\n"
+        finally:
+            body.close()
+    
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
 @router.get("/{client_id}", response_model=ClientSchema)
 async def read_client(
     client_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Get a specific client by ID
     """
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = await db.scalar(select(Client).filter(Client.id == client_id))
     
     if not client:
         raise HTTPException(
@@ -107,13 +196,13 @@ async def read_client(
 async def update_client(
     client_id: str,
     client_in: ClientUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Update a client
     """
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = await db.scalar(select(Client).filter(Client.id == client_id))
     
     if not client:
         raise HTTPException(
@@ -121,13 +210,30 @@ async def update_client(
             detail="Client not found",
         )
     
-    # Check email uniqueness if updating email
+    # Check email and CPF uniqueness if either is changing, in one query
+    conflicts = []
     if client_in.email and client_in.email != client.email:
-        if db.query(Client).filter(Client.email == client_in.email).first():
+        conflicts.append(Client.email == client_in.email)
+    if client_in.cpf and normalize_cpf(client_in.cpf) != client.cpf_normalized:
+        conflicts.append(Client.cpf_normalized == normalize_cpf(client_in.cpf))
+    
+    if conflicts:
+        duplicates = (await db.execute(
+            select(Client.email, Client.cpf_normalized)
+            .filter(or_(*conflicts), Client.id != client.id)
+            .limit(2)
+        )).all()
+        
+        if any(row.email == client_in.email for row in duplicates):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
+        if duplicates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CPF already registered",
+            )
     
     # Update client fields
     update_data = client_in.dict(exclude_unset=True)
@@ -136,21 +242,21 @@ async def update_client(
         setattr(client, field, value)
     
     db.add(client)
-    db.commit()
-    db.refresh(client)
+    await db.commit()
+    await db.refresh(client)
     
     return client
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_client(
     client_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_admin_user),  # Only admins can delete
 ):
     """
     Delete a client
     """
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = await db.scalar(select(Client).filter(Client.id == client_id))
     
     if not client:
         raise HTTPException(
@@ -158,7 +264,7 @@ async def delete_client(
             detail="Client not found",
         )
     
-    db.delete(client)
-    db.commit()
+    await db.delete(client)
+    await db.commit()
     
     return None
\ No newline at end of file
@@ -1,24 +1,29 @@
-from typing import List, Optional
-from datetime import datetime, date
+from collections import defaultdict
+from typing import List, Optional, Union
+from datetime import datetime, date, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_async_db
+from app.api.dependencies.pagination import keyset_page, keyset_query, order_by_keyset
 from app.core.security import get_current_active_user, get_current_admin_user
-from app.models.order import Order, OrderItem, OrderStatus
+from app.core.serialization import FastJSONResponse
+from app.models.order import Order, OrderItem, OrderStatus, order_in_section
 from app.models.product import Product
 from app.models.user import User
-from app.schemas.order import OrderCreate, OrderUpdate, Order as OrderSchema
-from app.api.endpoints.whatsapp import send_order_notification
+from app.schemas.order import OrderCreate, OrderUpdate, Order as OrderSchema, OrderPage
+from app.models.notification import NotificationKind
+from app.services.catalog import product_cache
+from app.services.export import export_response
+from app.services.outbox import enqueue_order_notification
+from app.services.sales import apply_sales_delta, order_section_totals, utc_day
 
 router = APIRouter()
 
-@router.get("/", response_model=List[OrderSchema])
-async def read_orders(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    skip: int = 0,
-    limit: int = 100,
+def filter_orders(
+    query,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     section: Optional[str] = None,
@@ -27,10 +32,8 @@ async def read_orders(
     client_id: Optional[str] = None,
 ):
     """
-    Retrieve orders with pagination and filtering options
+    Apply the order list filters to a query
     """
-    query = db.query(Order)
-    
     # Apply filters if provided
     if start_date:
         query = query.filter(Order.created_at >= datetime.combine(start_date, datetime.min.time()))
@@ -45,24 +48,124 @@ async def read_orders(
     
     # Filter by product section
     if section:
-        # This requires a join with OrderItem and Product
-        query = (
-            query
-            .join(OrderItem, Order.id == OrderItem.order_id)
-            .join(Product, OrderItem.product_id == Product.id)
-            .filter(Product.section == section)
-            .distinct()
+        query = query.filter(order_in_section(section))
+    
+    return query
+
+# Columns of the order list, in OrderSchema field order
+ORDER_FIELDS = (
+    Order.client_id, Order.status, Order.notes, Order.total_amount,
+    Order.id, Order.created_at, Order.updated_at, Order.created_by,
+)
+
+# Item ids per IN query, as selectinload batches them
+ITEM_BATCH_SIZE = 500
+
+async def order_rows(db: AsyncSession, orders) -> List[dict]:
+    """
+    Build the OrderSchema payload of a page of order column rows without
+    ORM objects or model validation. Items come from one IN query per batch.
+    """
+    items = defaultdict(list)
+    order_ids = [order.id for order in orders]
+    for start in range(0, len(order_ids), ITEM_BATCH_SIZE):
+        rows = await db.execute(
+            select(
+                OrderItem.order_id, OrderItem.product_id, OrderItem.quantity,
+                OrderItem.unit_price, OrderItem.id, OrderItem.created_at,
+            ).filter(OrderItem.order_id.in_(order_ids[start:start + ITEM_BATCH_SIZE]))
         )
+        for order_id, product_id, quantity, unit_price, item_id, created_at in rows:
+            items[order_id].append({
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": float(unit_price),
+                # The item schema recomputes total_price from quantity and unit_price
+                "total_price": quantity * float(unit_price),
+                "id": item_id,
+                "order_id": order_id,
+                "created_at": created_at,
+            })
+    
+    return [
+        {
+            "client_id": order.client_id,
+            "status": order.status,
+            "notes": order.notes,
+            "total_amount": None if order.total_amount is None else float(order.total_amount),
+            "id": order.id,
+            "created_at": order.created_at,
+            "updated_at": order.updated_at,
+            "created_by": order.created_by,
+            "items": items[order.id],
+        }
+        for order in orders
+    ]
+
+@router.get("/", response_model=Union[List[OrderSchema], OrderPage])
+async def read_orders(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    section: Optional[str] = None,
+    order_id: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    client_id: Optional[str] = None,
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from next_cursor; send it empty for the first page"
+    ),
+):
+    """
+    Retrieve orders with pagination and filtering options.
+    When cursor is given, returns a page with items and next_cursor instead of a list.
+    """
+    # Column rows encoded straight to JSON: no ORM objects, no model validation
+    query = filter_orders(
+        select(*ORDER_FIELDS),
+        start_date, end_date, section, order_id, status, client_id,
+    )
+    
+    # Keyset pagination: cost does not grow with the page number
+    if cursor is not None:
+        orders = (await db.execute(keyset_query(query, Order, cursor, limit, db.get_bind().dialect.name))).all()
+        page = keyset_page(orders, limit)
+        return FastJSONResponse({"items": await order_rows(db, page["items"]), "next_cursor": page["next_cursor"]})
     
     # Get paginated results
-    orders = query.offset(skip).limit(limit).all()
+    orders = (await db.execute(order_by_keyset(query, Order).offset(skip).limit(limit))).all()
     
-    return orders
+    return FastJSONResponse(await order_rows(db, orders))
+
+@router.get("/export")
+async def export_orders(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    section: Optional[str] = None,
+    order_id: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    client_id: Optional[str] = None,
+):
+    """
+    Stream every order matching the list filters as NDJSON or CSV.
+    Items are not included; one line per order.
+    """
+    query = filter_orders(
+        select(*Order.__table__.columns),
+        start_date, end_date, section, order_id, status, client_id,
+    )
+    
+    return export_response(db, order_by_keyset(query, Order), format, "orders")
 
 @router.post("/", response_model=OrderSchema, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_in: OrderCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -75,9 +178,20 @@ async def create_order(
             detail="Order must contain at least one item",
         )
     
+    # Quantities per product, summed over lines that repeat a product
+    quantities = defaultdict(int)
+    for item in order_in.items:
+        quantities[item.product_id] += item.quantity
+    
+    # Load every product in the basket with a single IN (...) query
+    products = {
+        product.id: product
+        for product in await db.scalars(select(Product).filter(Product.id.in_(quantities)))
+    }
+    
     # Validate that all products exist and have enough stock
     for item in order_in.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        product = products.get(item.product_id)
         
         if not product:
             raise HTTPException(
@@ -85,7 +199,7 @@ async def create_order(
                 detail=f"Product with id {item.product_id} not found",
             )
         
-        if product.stock < item.quantity:
+        if product.stock < quantities[item.product_id]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Not enough stock for product {product.description}",
@@ -94,58 +208,71 @@ async def create_order(
     # Calculate total amount if not provided
     total_amount = sum(item.quantity * item.unit_price for item in order_in.items)
     
-    # Create new order
+    # Create new order; its items are inserted in one batch when it is flushed.
+    # created_at is set here so the sales rollup day is known without a flush.
     db_order = Order(
         client_id=order_in.client_id,
         status=order_in.status,
         total_amount=total_amount,
         notes=order_in.notes,
         created_by=current_user.id,
+        created_at=datetime.now(timezone.utc),
+        items=[
+            OrderItem(
+                product_id=item.product_id,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                total_price=item.quantity * item.unit_price,
+            )
+            for item in order_in.items
+        ],
     )
-    
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
     
-    # Add order items and update product stock
-    for item in order_in.items:
-        db_item = OrderItem(
-            order_id=db_order.id,
-            product_id=item.product_id,
-            quantity=item.quantity,
-            unit_price=item.unit_price,
-            total_price=item.quantity * item.unit_price,
+    # Decrement stock for every product with one set-based UPDATE. The stock
+    # guard makes a concurrent order that drained a product since the check
+    # above fail here instead of driving the stock negative.
+    quantity = case(quantities, value=Product.id)
+    result = await db.execute(
+        update(Product)
+        .filter(Product.id.in_(quantities), Product.stock >= quantity)
+        .values(stock=Product.stock - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(quantities):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Stock changed while the order was being placed, please retry",
         )
-        
-        db.add(db_item)
-        
-        # Update product stock
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        product.stock -= item.quantity
-        db.add(product)
     
-    db.commit()
-    db.refresh(db_order)
+    # Sales rollup: item totals per section of the new order
+    section_totals = defaultdict(float)
+    for item in order_in.items:
+        section_totals[products[item.product_id].section] += item.quantity * item.unit_price
+    await apply_sales_delta(db, utc_day(db_order.created_at), db_order.status, section_totals)
+    
+    # WhatsApp notification, delivered by the outbox worker once committed
+    enqueue_order_notification(db, db_order)
     
-    # Send WhatsApp notification
-    try:
-        await send_order_notification(db_order.id, db)
-    except Exception as e:
-        # Log the error but don't fail the order creation
-        print(f"Error sending WhatsApp notification: {e}")
+    await db.commit()
+    # Stock changed: cached product responses are stale
+    product_cache.invalidate()
     
     return db_order
 
 @router.get("/{order_id}", response_model=OrderSchema)
 async def read_order(
     order_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Get a specific order by ID
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = await db.scalar(
+        select(Order).options(selectinload(Order.items)).filter(Order.id == order_id)
+    )
     
     if not order:
         raise HTTPException(
@@ -159,13 +286,16 @@ async def read_order(
 async def update_order(
     order_id: str,
     order_in: OrderUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Update an order (status and notes only)
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    # Lock the order so concurrent status changes apply their rollup deltas in turn
+    order = await db.scalar(
+        select(Order).options(selectinload(Order.items)).filter(Order.id == order_id).with_for_update()
+    )
     
     if not order:
         raise HTTPException(
@@ -180,30 +310,32 @@ async def update_order(
     for field, value in update_data.items():
         setattr(order, field, value)
     
-    db.add(order)
-    db.commit()
-    db.refresh(order)
-    
-    # Send WhatsApp notification if status changed
+    # Move the order between status rollups and queue a WhatsApp notification
+    # in the same transaction if status changed
     if old_status != order.status:
-        try:
-            await send_order_notification(order.id, db, status_change=True)
-        except Exception as e:
-            # Log the error but don't fail the order update
-            print(f"Error sending WhatsApp notification: {e}")
+        section_totals = await order_section_totals(db, order.id)
+        day = utc_day(order.created_at)
+        await apply_sales_delta(db, day, old_status, section_totals, sign=-1)
+        await apply_sales_delta(db, day, order.status, section_totals)
+        enqueue_order_notification(db, order, NotificationKind.ORDER_STATUS_CHANGED)
+    
+    db.add(order)
+    await db.commit()
+    await db.refresh(order)
     
     return order
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_order(
     order_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_admin_user),  # Only admins can delete
 ):
     """
     Delete an order
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    # Lock the order: a concurrent delete waits, then finds it gone and returns 404
+    order = await db.scalar(select(Order).filter(Order.id == order_id).with_for_update())
     
     if not order:
         raise HTTPException(
@@ -212,16 +344,22 @@ async def delete_order(
         )
     
     # Restore product stock for each order item
-    order_items = db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
+    order_items = (await db.scalars(select(OrderItem).filter(OrderItem.order_id == order_id))).all()
     
     for item in order_items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        product = await db.scalar(select(Product).filter(Product.id == item.product_id))
         
         if product:
             product.stock += item.quantity
             db.add(product)
     
-    db.delete(order)
-    db.commit()
+    # Remove the order from the sales rollup
+    await apply_sales_delta(
+        db, utc_day(order.created_at), order.status, await order_section_totals(db, order.id), sign=-1
+    )
+    
+    await db.delete(order)
+    await db.commit()
+    product_cache.invalidate()
     
     return None
\ No newline at end of file
@@ -1,31 +1,37 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_async_db, use_primary
+from app.api.dependencies.http_cache import cached_response
+from app.api.dependencies.pagination import keyset_page, keyset_query, order_by_keyset
+from app.db.search import text_search
 from app.core.security import get_current_active_user, get_current_admin_user
 from app.models.product import Product, ProductImage
 from app.models.user import User
-from app.schemas.product import ProductCreate, ProductUpdate, Product as ProductSchema
+from app.schemas.bulk import BulkResult
+from app.schemas.product import ProductCreate, ProductUpdate, Product as ProductSchema, ProductPage
+from app.services.bulk import BulkReport, detect_format, iter_records
+from app.services.catalog import copy_products, product_cache, upsert_products
+from app.services.export import export_response
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ProductSchema])
-async def read_products(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    skip: int = 0,
-    limit: int = 100,
+product_list = TypeAdapter(List[ProductSchema])
+
+def filter_products(
+    query,
     category: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     available: Optional[bool] = None,
 ):
     """
-    Retrieve products with pagination and filtering options
+    Apply the product list filters to a query
     """
-    query = db.query(Product)
-    
     # Apply filters if provided
     if category:
         query = query.filter(Product.section == category)
@@ -39,28 +45,128 @@ async def read_products(
         else:
             query = query.filter((Product.stock == 0) | (Product.is_active == False))
     
-    # Get paginated results
-    products = query.offset(skip).limit(limit).all()
+    return query
+
+@router.get("/", response_model=Union[List[ProductSchema], ProductPage])
+async def read_products(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+    skip: int = 0,
+    limit: int = 100,
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    available: Optional[bool] = None,
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from next_cursor; send it empty for the first page"
+    ),
+):
+    """
+    Retrieve products with pagination and filtering options.
+    When cursor is given, returns a page with items and next_cursor instead of a list.
+    Responses are cached and carry an ETag; If-None-Match gets 304 Not Modified.
+    """
+    # Serve from the response cache, keyed by the normalized parameters
+    key = ("list", skip, limit, category, min_price, max_price, available, cursor)
+    version, entry = product_cache.lookup(key)
+    if entry:
+        return cached_response(request, entry)
+    # Shared by every user until the next write: never fill it from a lagging replica
+    use_primary(db)
+    
+    query = filter_products(
+        select(Product).options(selectinload(Product.images)),
+        category, min_price, max_price, available,
+    )
     
-    return products
+    # Keyset pagination: cost does not grow with the page number
+    if cursor is not None:
+        products = (await db.scalars(keyset_query(query, Product, cursor, limit, db.get_bind().dialect.name))).all()
+        body = ProductPage.model_validate(keyset_page(products, limit), from_attributes=True).model_dump_json().encode()
+    else:
+        # Get paginated results
+        products = (await db.scalars(order_by_keyset(query, Product).offset(skip).limit(limit))).all()
+        body = product_list.dump_json(product_list.validate_python(products, from_attributes=True))
+    
+    return cached_response(request, product_cache.store(version, key, body))
+
+@router.get("/export")
+async def export_products(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    available: Optional[bool] = None,
+):
+    """
+    Stream every product matching the list filters as NDJSON or CSV.
+    Images are not included.
+    """
+    query = filter_products(select(*Product.__table__.columns), category, min_price, max_price, available)
+    
+    return export_response(db, order_by_keyset(query, Product), format, "products")
+
+@router.get("/search", response_model=List[ProductSchema])
+async def search_products(
+    request: Request,
+    q: str = Query(..., min_length=2, description="Words or fragments of the product description"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+    skip: int = 0,
+    limit: int = 20,
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    available: Optional[bool] = None,
+):
+    """
+    Search product descriptions, most relevant first. Accepts the list filters.
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Search query is empty",
+        )
+    key = ("search", q, skip, limit, category, min_price, max_price, available)
+    version, entry = product_cache.lookup(key)
+    if entry:
+        return cached_response(request, entry)
+    # Shared by every user until the next write: never fill it from a lagging replica
+    use_primary(db)
+    
+    condition, rank = text_search(db.get_bind().dialect.name, Product.description, q)
+    query = filter_products(
+        select(Product).options(selectinload(Product.images)).filter(condition),
+        category, min_price, max_price, available,
+    )
+    products = (await db.scalars(
+        query.order_by(rank.desc(), Product.created_at, Product.id).offset(skip).limit(limit)
+    )).all()
+    
+    body = product_list.dump_json(product_list.validate_python(products, from_attributes=True))
+    return cached_response(request, product_cache.store(version, key, body))
 
 @router.post("/", response_model=ProductSchema, status_code=status.HTTP_201_CREATED)
 async def create_product(
     product_in: ProductCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Create a new product
     """
     # Check if product with this barcode already exists
-    if product_in.barcode and db.query(Product).filter(Product.barcode == product_in.barcode).first():
+    if product_in.barcode and await db.scalar(select(Product).filter(Product.barcode == product_in.barcode)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Barcode already registered",
         )
     
-    # Create new product
+    # Create new product together with its images, if provided
     db_product = Product(
         description=product_in.description,
         price=product_in.price,
@@ -70,37 +176,74 @@ async def create_product(
         expiration_date=product_in.expiration_date,
         is_active=product_in.is_active,
         created_by=current_user.id,
-    )
-    
-    db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
-    
-    # Add product images if provided
-    if product_in.images:
-        for image_data in product_in.images:
-            db_image = ProductImage(
-                product_id=db_product.id,
+        images=[
+            ProductImage(
                 image_url=image_data.image_url,
                 is_primary=image_data.is_primary,
             )
-            db.add(db_image)
-        
-        db.commit()
-        db.refresh(db_product)
+            for image_data in product_in.images or []
+        ],
+    )
+    
+    db.add(db_product)
+    await db.commit()
+    product_cache.invalidate()
     
     return db_product
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_products(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults to the Content-Type"),
+    copy: bool = Query(False, description="PostgreSQL only: load through COPY into a staging table"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Create or update products by barcode from a streamed CSV (with a header
+    row) or NDJSON body. Rows are validated like POST /products and written in
+    batches; invalid rows are skipped and listed in the response. Columns a
+    row leaves out keep their current value on existing products.
+    """
+    records = iter_records(request.stream(), detect_format(request.headers.get("content-type"), format))
+    
+    if copy and db.get_bind().dialect.name != "postgresql":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="COPY is only available on PostgreSQL",
+        )
+    
+    report = BulkReport()
+    try:
+        if copy:
+            await copy_products(db, records, current_user.id, report)
+        else:
+            await upsert_products(db, records, current_user.id, report)
+    finally:
+        # Batches committed before a failure are visible too
+        product_cache.invalidate()
+    
+    return report.as_dict()
+
 @router.get("/{product_id}", response_model=ProductSchema)
 async def read_product(
     product_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
-    Get a specific product by ID
+    Get a specific product by ID. Cached with an ETag like the product list.
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
+    version, entry = product_cache.lookup(("detail", product_id))
+    if entry:
+        return cached_response(request, entry)
+    # Shared by every user until the next write: never fill it from a lagging replica
+    use_primary(db)
+    
+    product = await db.scalar(
+        select(Product).options(selectinload(Product.images)).filter(Product.id == product_id)
+    )
     
     if not product:
         raise HTTPException(
@@ -108,19 +251,22 @@ async def read_product(
             detail="Product not found",
         )
     
-    return product
+    body = ProductSchema.model_validate(product, from_attributes=True).model_dump_json().encode()
+    return cached_response(request, product_cache.store(version, ("detail", product_id), body))
 
 @router.put("/{product_id}", response_model=ProductSchema)
 async def update_product(
     product_id: str,
     product_in: ProductUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Update a product
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = await db.scalar(
+        select(Product).options(selectinload(Product.images)).filter(Product.id == product_id)
+    )
     
     if not product:
         raise HTTPException(
@@ -130,7 +276,7 @@ async def update_product(
     
     # Check barcode uniqueness if updating barcode
     if product_in.barcode and product_in.barcode != product.barcode:
-        if db.query(Product).filter(Product.barcode == product_in.barcode).first():
+        if await db.scalar(select(Product).filter(Product.barcode == product_in.barcode)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Barcode already registered",
@@ -143,21 +289,22 @@ async def update_product(
         setattr(product, field, value)
     
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    await db.commit()
+    product_cache.invalidate()
+    await db.refresh(product)
     
     return product
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_admin_user),  # Only admins can delete
 ):
     """
     Delete a product
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = await db.scalar(select(Product).filter(Product.id == product_id))
     
     if not product:
         raise HTTPException(
@@ -165,7 +312,8 @@ async def delete_product(
             detail="Product not found",
         )
     
-    db.delete(product)
-    db.commit()
+    await db.delete(product)
+    await db.commit()
+    product_cache.invalidate()
     
     return None
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.database import get_async_db
+from app.core.security import get_current_active_user
+from app.models.order import OrderStatus
+from app.models.user import User
+from app.services.sales import GROUP_COLUMNS, sales_report
+
+router = APIRouter()
+
+@router.get("/sales")
+async def read_sales_report(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    section: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    group_by: List[str] = Query(["day", "section"], description="Any of day, section and status"),
+):
+    """
+    Order counts and revenue per day, section and/or status, answered from the
+    sales rollup instead of the orders table. An order with items from several
+    sections is counted once in each section, and once when not grouped or
+    filtered by section.
+    """
+    unknown = set(group_by) - set(GROUP_COLUMNS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot group by {', '.join(sorted(unknown))}",
+        )
+    
+    return await sales_report(db, list(dict.fromkeys(group_by)), start_date, end_date, section, status)
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Every named cache, so stats can be reported from one place
+caches: Dict[str, "TTLCache"] = {}
+
+_MISSING = object()
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a time-to-live.
+    Safe to share between the event loop and threadpool workers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats(maxsize=maxsize)
+        caches[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= self.timer():
+                del self._data[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; ttl overrides the cache default for this entry."""
+        if self.maxsize <= 0:
+            return
+        expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**asdict(self._stats), "size": len(self._data)})
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+class VersionedResponseCache:
+    """
+    Serialized responses keyed by normalized request parameters.
+    invalidate() moves to a new version, so every earlier entry is dropped at
+    once, and a response built from data read before the invalidation can
+    never be stored under the new version.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.entries = TTLCache(name, maxsize, ttl)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable) -> Tuple[int, Optional[CachedResponse]]:
+        """The current version, and the entry for key under it if any."""
+        version = self.version
+        return version, self.entries.get((version, key))
+
+    def store(self, version: int, key: Hashable, body: bytes) -> CachedResponse:
+        entry = CachedResponse(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+        with self._lock:
+            if version == self.version:
+                self.entries.set((version, key), entry)
+        return entry
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self.entries.clear()
+
+def cache_stats() -> Dict[str, dict]:
+    """Stats hook: hit rate and counters of every named cache."""
+    return {name: cache.stats().as_dict() for name, cache in caches.items()}
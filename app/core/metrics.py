@@ -0,0 +1,186 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from app.core.cache import cache_stats
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow exports
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + "}"
+
+def format_value(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+class Metric:
+    """
+    A named metric with a fixed set of label names. Values are kept per
+    label tuple; updates are cheap and safe from threadpool workers.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def _add(self, labels: Tuple[str, ...], amount: float) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, labels)), value) for labels, value in values]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._add(labels, amount)
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._add(labels, amount)
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._add(labels, -amount)
+
+class Histogram(Metric):
+    """Cumulative buckets plus _sum and _count, as Prometheus expects."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._histograms.get(labels)
+            if counts is None:
+                # One slot per bucket, then +Inf, then the sum
+                counts = self._histograms[labels] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            histograms = [(labels, list(counts)) for labels, counts in self._histograms.items()]
+        samples = []
+        for labels, counts in histograms:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**base, "le": format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", base, counts[-1]))
+            samples.append((f"{self.name}_count", base, cumulative))
+        return samples
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+registry: List[Metric] = []
+
+# Functions returning (name, kind, documentation, samples) for values read at scrape time
+collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+    families = [(metric.name, metric.kind, metric.documentation, metric.samples()) for metric in registry]
+    for collect in collectors:
+        families.extend(collect())
+    lines = []
+    for name, kind, documentation, samples in families:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{sample}{format_labels(labels)} {format_value(value)}" for sample, labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests by route template and status code", ["method", "route", "status"]
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"]
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", ["method"]
+)
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a database connection from the pool"
+)
+whatsapp_send_duration = Histogram(
+    "whatsapp_send_duration_seconds", "WhatsApp provider send latency", ["provider", "outcome"]
+)
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count, latency and status code of every
+    request under its route template, e.g. /orders/{order_id}. Paths that
+    match no route are labelled "unmatched", so label values stay bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in METHODS else "OTHER"
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_progress.dec(method)
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            template = getattr(route, "path", "unmatched")
+            http_request_duration.observe(elapsed, method, template)
+            http_requests.inc(method, template, str(status_code))
+
+def cache_metrics():
+    """Counters and size of every named in-process cache."""
+    stats = cache_stats()
+    for field, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("size", "gauge")):
+        name = f"cache_{field}_total" if kind == "counter" else f"cache_{field}"
+        samples = [(name, {"cache": cache}, values[field]) for cache, values in stats.items()]
+        yield name, kind, f"In-process cache {field}", samples
+
+collectors.append(cache_metrics)
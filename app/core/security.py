@@ -1,19 +1,62 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Optional, Tuple, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_async_db
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+# bcrypt releases the GIL, so a small pool hashes in parallel without
+# blocking the event loop; its size bounds the CPU spent on hashing
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Authenticated user as seen by the endpoints, detached from any session."""
+    id: str
+    email: str
+    username: str
+    full_name: Optional[str]
+    is_active: bool
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+        )
+
+# Saves the users lookup on every authenticated request. Entries are evicted
+# by the /auth/users/me handlers and otherwise live for the TTL at most.
+principal_cache = TTLCache(
+    "principals",
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -22,6 +65,45 @@ def get_password_hash(password: str) -> str:
     """Generate a password hash."""
     return pwd_context.hash(password)
 
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password in the hashing executor.
+    Also returns a new hash when the stored one uses outdated settings.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate a password hash in the hashing executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
+# Memo of verified claims so a reused token skips signature verification.
+# Entries live until the token's exp at most and are keyed by a SHA-256
+# digest, so raw tokens are not kept in memory.
+token_cache = TTLCache(
+    "tokens",
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+def decode_access_token(token: str) -> dict:
+    """Verify a JWT and return its claims, memoized until it expires."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a new JWT token."""
     to_encode = data.copy()
@@ -35,8 +117,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> UserPrincipal:
     """Get the current user from the token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,28 +127,33 @@ async def get_current_user(
     )
     
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
+    # Lets the session keep this user's reads on the primary after their writes
+    db.info["user_id"] = user_id
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await db.scalar(select(User).filter(User.id == user_id))
+        if user is None:
+            raise credentials_exception
+        principal = UserPrincipal.from_user(user)
+        principal_cache.set(user_id, principal)
     
-    return user
+    return principal
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     """Check if the current user is active."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-async def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+async def get_current_admin_user(current_user: UserPrincipal = Depends(get_current_active_user)) -> UserPrincipal:
     """Check if the current user is an admin."""
     if not current_user.is_admin:
         raise HTTPException(
@@ -0,0 +1,22 @@
+import orjson
+from fastapi.responses import Response
+
+def dumps(content) -> bytes:
+    """
+    Encode plain dicts and lists the way FastAPI sends a validated
+    response_model: compact UTF-8, enums by value and UTC datetimes with a
+    "Z" suffix, as Pydantic writes them.
+    """
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+class FastJSONResponse(Response):
+    """
+    JSON response for content already shaped like the response model.
+    FastAPI returns Response instances as they are, so the model is only
+    used for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
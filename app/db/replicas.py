@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+import logging
+from typing import List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary; 0 when it has replayed everything received
+REPLICATION_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+class ReplicaSet:
+    """
+    Read replicas handed out round-robin, skipping any that failed their
+    last health check or dropped a connection since. check() runs in the
+    background and brings replicas back once they answer and have caught up.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], check_interval: float, max_lag: float):
+        self.engines = list(engines)
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.down: Set[AsyncEngine] = set()
+        self._turn = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        for engine in self.engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """The next healthy replica, or None to read from the primary."""
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self._turn) % len(self.engines)]
+            if engine not in self.down:
+                return engine
+        return None
+
+    def _on_error(self, context) -> None:
+        # Connection refused or lost: stop routing to it until it passes a check
+        if context.is_disconnect or context.connection is None:
+            for engine in self.engines:
+                if engine.sync_engine is context.engine:
+                    self.mark_down(engine, context.original_exception)
+
+    def mark_down(self, engine: AsyncEngine, reason) -> None:
+        if engine not in self.down:
+            logger.warning("Replica %s taken out of rotation: %s", engine.url, reason)
+            self.down.add(engine)
+
+    async def check(self) -> None:
+        """Ping every replica and compare its replication lag with max_lag."""
+        for engine in self.engines:
+            try:
+                async with engine.connect() as connection:
+                    lag = 0.0
+                    if connection.dialect.name == "postgresql":
+                        lag = float(await connection.scalar(REPLICATION_LAG) or 0)
+                    else:
+                        await connection.execute(text("SELECT 1"))
+            except Exception as e:
+                # Driver errors such as a bad connect argument are not wrapped by SQLAlchemy
+                self.mark_down(engine, e)
+                continue
+            if lag > self.max_lag:
+                self.mark_down(engine, f"{lag:.1f}s behind the primary")
+            elif engine in self.down:
+                logger.info("Replica %s back in rotation", engine.url)
+                self.down.discard(engine)
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Replica health check failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
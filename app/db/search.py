@@ -0,0 +1,58 @@
+from sqlalchemy import Index, and_, case, false, func, literal, literal_column, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+# Text search configuration of the product description index. Queries must
+# use the same literal for PostgreSQL to match the index expression.
+SEARCH_CONFIG = literal_column("'portuguese'")
+
+def text_document(column) -> ColumnElement:
+    return func.to_tsvector(SEARCH_CONFIG, column)
+
+def fts_index(name: str, column) -> Index:
+    """GIN index on the tsvector of a column (PostgreSQL only)."""
+    return Index(name, text_document(column), postgresql_using="gin").ddl_if(dialect="postgresql")
+
+def trigram_index(name: str, column: str) -> Index:
+    """GIN trigram index; serves ILIKE '%...%' and similarity operators (PostgreSQL only)."""
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql")
+
+def escape_like(term: str) -> str:
+    return term.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+def icontains(column, term: str) -> ColumnElement:
+    return column.ilike(f"%{escape_like(term)}%", escape="/")
+
+def istartswith(column, term: str) -> ColumnElement:
+    return column.ilike(f"{escape_like(term)}%", escape="/")
+
+def text_search(dialect: str, column, q: str):
+    """
+    Condition and relevance rank for a free text search on column.
+    PostgreSQL matches words through the tsvector index (stemmed, ranked with
+    ts_rank_cd) or fragments and typos through the trigram index. Other
+    databases require every term as a substring. A query without terms
+    matches nothing.
+    """
+    terms = q.split()
+    if not terms:
+        return false(), literal(0)
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        condition = or_(text_document(column).op("@@")(query), literal(q).op("<%")(column))
+        rank = func.ts_rank_cd(text_document(column), query) + func.word_similarity(q, column)
+        return condition, rank
+    condition = and_(*(icontains(column, term) for term in terms))
+    return condition, case((istartswith(column, terms[0]), 1), else_=0)
+
+def fuzzy_search(dialect: str, columns, q: str):
+    """
+    Condition and relevance rank for a name-like search across columns,
+    served by their trigram indexes on PostgreSQL.
+    """
+    condition = or_(*(icontains(column, q) for column in columns))
+    if dialect == "postgresql":
+        condition = or_(condition, *(literal(q).op("<%")(column) for column in columns))
+        return condition, func.greatest(*(func.word_similarity(q, column) for column in columns))
+    return condition, case(*((istartswith(column, q), 1) for column in columns), else_=0)
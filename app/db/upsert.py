@@ -0,0 +1,34 @@
+from typing import Iterable, Optional
+
+from sqlalchemy.sql.dml import Insert
+
+def dialect_insert(dialect: str, model) -> Insert:
+    """The dialect's INSERT construct, which supports ON CONFLICT clauses."""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upsert is not supported on {dialect}")
+    return insert(model)
+
+def upsert(
+    dialect: str,
+    model,
+    index_elements: Iterable[str],
+    update_columns: Iterable[str],
+    extra: Optional[dict] = None,
+) -> Insert:
+    """
+    INSERT ... ON CONFLICT DO UPDATE for PostgreSQL and SQLite.
+    Conflicting rows get update_columns from the new row, plus any extra values.
+    """
+    statement = dialect_insert(dialect, model)
+    return statement.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={**{column: statement.excluded[column] for column in update_columns}, **(extra or {})},
+    )
+
+def insert_ignore(dialect: str, model) -> Insert:
+    """INSERT ... ON CONFLICT DO NOTHING, for any unique constraint."""
+    return dialect_insert(dialect, model).on_conflict_do_nothing()
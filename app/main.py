@@ -1,10 +1,21 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import sentry_sdk
 import os
-from app.api.endpoints import auth, clients, products, orders, whatsapp
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.endpoints import auth, clients, products, orders, reports, whatsapp
+from app.api.dependencies.database import (
+    AsyncSessionLocal, QueryStatsMiddleware, async_engine, get_async_db, pool_status, replicas
+)
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, render as render_metrics
+from app.services.broadcast import BroadcastWorker
+from app.services.messaging import close_provider
+from app.services.outbox import OutboxWorker
 
 # Initialize Sentry for error monitoring
 # if settings.SENTRY_DSN:
@@ -13,10 +24,29 @@ from app.core.config import settings
 #         traces_sample_rate=1.0,
 #     )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Deliver queued WhatsApp order notifications and broadcasts, and health-check
+    # read replicas, in the background
+    workers = []
+    if settings.OUTBOX_WORKER_ENABLED:
+        workers.append(OutboxWorker(AsyncSessionLocal))
+    if settings.BROADCAST_WORKER_ENABLED:
+        workers.append(BroadcastWorker(AsyncSessionLocal))
+    if replicas:
+        workers.append(replicas)
+    for worker in workers:
+        worker.start()
+    yield
+    for worker in workers:
+        await worker.stop()
+    await close_provider()
+
 app = FastAPI(
     title="Lu Estilo API",
     description="API for Lu Estilo clothing company sales management",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -28,12 +58,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query count, DB time and N+1 detection
+app.add_middleware(QueryStatsMiddleware)
+
+# Per-route request counts, latency histograms and status codes
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include all routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(clients.router, prefix="/clients", tags=["Clients"])
 app.include_router(products.router, prefix="/products", tags=["Products"])
 app.include_router(orders.router, prefix="/orders", tags=["Orders"])
 app.include_router(whatsapp.router, prefix="/whatsapp", tags=["WhatsApp Integration"])
+app.include_router(reports.router, prefix="/reports", tags=["Reports"])
 
 
 # Global exception handler
@@ -47,4 +85,36 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.get("/", tags=["Health Check"])
 def health_check():
     """Endpoint to verify the API is running"""
-    return {"status": "healthy", "message": "Lu Estilo API is running"}
\ No newline at end of file
+    return {"status": "healthy", "message": "Lu Estilo API is running"}
+
+@app.get("/ready", tags=["Health Check"])
+async def readiness_check(response: Response, db: AsyncSession = Depends(get_async_db)):
+    """
+    Readiness probe: the database answers and the connection pool has room.
+    Returns 503 so the load balancer stops sending traffic to this worker.
+    """
+    # Measured before this probe takes a connection of its own
+    pool = pool_status(async_engine.pool)
+    saturated = pool["saturation"] is not None and pool["saturation"] >= settings.DB_POOL_READY_SATURATION
+    
+    # Probe the primary, whose pool was just measured, never a replica
+    db.info["read_only"] = False
+    
+    database = "skipped"
+    if not saturated:
+        try:
+            await db.execute(text("SELECT 1"))
+            database = "ok"
+        except (SQLAlchemyError, OSError):
+            database = "unavailable"
+    
+    ready = database == "ok"
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if ready else "not ready", "database": database, "pool": pool}
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Prometheus scrape endpoint"""
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,58 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum, Index, Text
+from sqlalchemy.sql import func
+from datetime import datetime, timezone
+import uuid
+import enum
+
+from app.api.dependencies.database import Base
+
+class BroadcastStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+class RecipientStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class BroadcastJob(Base):
+    """
+    A promotional WhatsApp message sent to many clients by the broadcast worker.
+    """
+    __tablename__ = "broadcast_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    message = Column(Text, nullable=False)
+    section = Column(String, nullable=True)
+    status = Column(Enum(BroadcastStatus), default=BroadcastStatus.PENDING, nullable=False)
+    total = Column(Integer, default=0, nullable=False)
+    sent = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    # Claim lease: a job whose worker died is picked up again once it passes
+    available_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_by = Column(String, ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_broadcast_jobs_status_available_at", "status", "available_at"),
+    )
+
+class BroadcastRecipient(Base):
+    """
+    Delivery state of a broadcast for one client.
+    """
+    __tablename__ = "broadcast_recipients"
+
+    job_id = Column(String, ForeignKey("broadcast_jobs.id", ondelete="CASCADE"), primary_key=True)
+    client_id = Column(String, ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(RecipientStatus), default=RecipientStatus.PENDING, nullable=False)
+    error = Column(String, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Pending recipients of a job and per-status result pages
+        Index("ix_broadcast_recipients_job_id_status", "job_id", "status"),
+    )
@@ -1,8 +1,15 @@
-from sqlalchemy import Boolean, Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
+import re
 import uuid
 
 from app.api.dependencies.database import Base
+from app.db.search import trigram_index
+
+def normalize_cpf(cpf: str) -> str:
+    """Digits-only form of a CPF, used for uniqueness lookups."""
+    return re.sub(r'[^0-9]', '', cpf)
 
 class Client(Base):
     __tablename__ = "clients"
@@ -11,6 +18,7 @@ class Client(Base):
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     cpf = Column(String, unique=True, index=True, nullable=False)
+    cpf_normalized = Column(String, unique=True, index=True, nullable=False)
     phone = Column(String, nullable=False)
     address = Column(String)
     city = Column(String)
@@ -19,4 +27,18 @@ class Client(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    created_by = Column(String, ForeignKey("users.id"))
\ No newline at end of file
+    created_by = Column(String, ForeignKey("users.id"))
+
+    __table_args__ = (
+        # Keyset pagination order within a user's clients
+        Index("ix_clients_created_by_created_at_id", "created_by", "created_at", "id"),
+        # Substring filters and the ?q= search on name and email
+        trigram_index("ix_clients_name_trgm", "name"),
+        trigram_index("ix_clients_email_trgm", "email"),
+    )
+
+    @validates("cpf")
+    def sync_cpf_normalized(self, key, value):
+        # Keep the indexed digits-only column in step with the display value
+        self.cpf_normalized = normalize_cpf(value)
+        return value
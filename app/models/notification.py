@@ -0,0 +1,43 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+import uuid
+import enum
+
+from app.api.dependencies.database import Base
+from app.models.order import OrderStatus
+
+class NotificationKind(str, enum.Enum):
+    ORDER_CREATED = "order_created"
+    ORDER_STATUS_CHANGED = "order_status_changed"
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class NotificationOutbox(Base):
+    """
+    WhatsApp notifications written in the same transaction as the order
+    change that triggers them, and delivered later by the outbox worker.
+    """
+    __tablename__ = "notification_outbox"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(Enum(NotificationKind), nullable=False)
+    order_id = Column(String, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    order_status = Column(Enum(OrderStatus), nullable=False)
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # Earliest time the next delivery attempt may run (retry backoff / claim lease)
+    available_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    order = relationship("Order")
+
+    __table_args__ = (
+        # Worker polling: pending rows that are due, oldest first
+        Index("ix_notification_outbox_status_available_at", "status", "available_at"),
+    )
@@ -1,10 +1,11 @@
-from sqlalchemy import Boolean, Column, String, Float, Integer, DateTime, ForeignKey, Enum
+from sqlalchemy import Boolean, Column, String, Float, Integer, DateTime, ForeignKey, Enum, Index, select
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 import enum
 
 from app.api.dependencies.database import Base
+from app.models.product import Product
 
 class OrderStatus(str, enum.Enum):
     PENDING = "pending"
@@ -27,6 +28,14 @@ class Order(Base):
     created_by = Column(String, ForeignKey("users.id"), nullable=True)
     items = relationship("OrderItem", backref="order", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        # Status and client filters, still in keyset order
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_orders_client_id_created_at_id", "client_id", "created_at", "id"),
+    )
+
 class OrderItem(Base):
     __tablename__ = "order_items"
 
@@ -37,3 +46,21 @@ class OrderItem(Base):
     unit_price = Column(Float, nullable=False)
     total_price = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Loading an order's items
+        Index("ix_order_items_order_id", "order_id"),
+        # Section filters go from products to their orders
+        Index("ix_order_items_product_id_order_id", "product_id", "order_id"),
+    )
+
+def order_in_section(section: str):
+    """
+    Semi-join condition: the order has at least one item from section.
+    Unlike joining the items, it keeps one row per order, so no DISTINCT.
+    """
+    return Order.id.in_(
+        select(OrderItem.order_id)
+        .join(Product, OrderItem.product_id == Product.id)
+        .filter(Product.section == section)
+    )
@@ -1,8 +1,10 @@
-from sqlalchemy import Boolean, Column, String, Float, Integer, DateTime, ForeignKey, Date
+from sqlalchemy import Boolean, Column, String, Float, Integer, DateTime, ForeignKey, Date, Index
 from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 import uuid
 
 from app.api.dependencies.database import Base
+from app.db.search import fts_index, trigram_index
 
 class Product(Base):
     __tablename__ = "products"
@@ -11,13 +13,25 @@ class Product(Base):
     description = Column(String, nullable=False)
     price = Column(Float, nullable=False)
     barcode = Column(String, unique=True, index=True)
-    section = Column(String, index=True, nullable=False)
+    section = Column(String, nullable=False)
     stock = Column(Integer, default=0)
     expiration_date = Column(Date, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     created_by = Column(String, ForeignKey("users.id"))
+    images = relationship("ProductImage", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # Category with an optional price range; also serves section lookups
+        Index("ix_products_section_price", "section", "price"),
+        Index("ix_products_price", "price"),
+        # GET /products/search: words, then fragments and typos
+        fts_index("ix_products_description_fts", description),
+        trigram_index("ix_products_description_trgm", "description"),
+    )
 
 class ProductImage(Base):
     __tablename__ = "product_images"
@@ -26,4 +40,9 @@ class ProductImage(Base):
     product_id = Column(String, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
     image_url = Column(String, nullable=False)
     is_primary = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Loading a product's images
+        Index("ix_product_images_product_id", "product_id"),
+    )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Float, Integer, Date, Enum
+
+from app.api.dependencies.database import Base
+from app.models.order import OrderStatus
+
+# Section of the per day and status rows covering every section, so
+# reports not split by section count each order once
+ALL_SECTIONS = ""
+
+class SalesRollup(Base):
+    """
+    Orders and revenue per day, product section and order status, kept up to
+    date by the order endpoints. An order with items from several sections
+    counts once in each, with the total of its items in that section, and
+    once more in the ALL_SECTIONS row of its day and status.
+    """
+    __tablename__ = "sales_rollups"
+
+    day = Column(Date, primary_key=True)
+    section = Column(String, primary_key=True)
+    status = Column(Enum(OrderStatus), primary_key=True)
+    order_count = Column(Integer, default=0, nullable=False)
+    total_amount = Column(Float, default=0.0, nullable=False)
@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+from app.models.broadcast import BroadcastStatus, RecipientStatus
+
+class BroadcastCreate(BaseModel):
+    message: str
+    section: Optional[str] = None
+
+class BroadcastJob(BaseModel):
+    id: str
+    message: str
+    section: Optional[str] = None
+    status: BroadcastStatus
+    total: int
+    sent: int
+    failed: int
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class BroadcastRecipient(BaseModel):
+    client_id: str
+    status: RecipientStatus
+    error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+# One page of per-client results; next_skip is None on the last page
+class BroadcastResults(BaseModel):
+    job: BroadcastJob
+    items: List[BroadcastRecipient]
+    next_skip: Optional[int] = None
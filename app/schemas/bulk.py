@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class BulkRowError(BaseModel):
+    row: int
+    key: Optional[str] = None
+    errors: List[str]
+
+class BulkRowSuperseded(BaseModel):
+    row: int
+    key: str
+    # Later row with the same key that was written instead
+    superseded_by: int
+
+class BulkResult(BaseModel):
+    received: int
+    created: int
+    updated: int
+    failed: int
+    superseded: int = 0
+    errors: List[BulkRowError]
+    # More rows failed than are listed in errors
+    errors_truncated: bool = False
+    superseded_rows: List[BulkRowSuperseded] = []
+    superseded_truncated: bool = False
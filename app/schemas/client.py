@@ -1,8 +1,61 @@
 from pydantic import BaseModel, EmailStr, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import re
 
+NON_DIGITS = re.compile(r'[^0-9]')
+
+def cpf_check_digit(digits: str, size: int) -> int:
+    """Check digit over the first `size` digits, weighted size + 1 down to 2."""
+    total = sum(int(digit) * weight for digit, weight in zip(digits, range(size + 1, 1, -1)))
+    remainder = total % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+def validate_cpf(v: str) -> str:
+    """Check CPF digits and return it formatted for display."""
+    # Remove non-numeric characters
+    cpf = NON_DIGITS.sub('', v)
+    
+    # Check if CPF has 11 digits
+    if len(cpf) != 11:
+        raise ValueError('CPF must have 11 digits')
+    
+    # Check if all digits are the same (invalid CPF)
+    if cpf == cpf[0] * 11:
+        raise ValueError('Invalid CPF')
+    
+    # Validate both check digits
+    if int(cpf[9]) != cpf_check_digit(cpf, 9) or int(cpf[10]) != cpf_check_digit(cpf, 10):
+        raise ValueError('Invalid CPF')
+    
+    return format_cpf(cpf)
+
+def format_cpf(cpf: str) -> str:
+    """Display form of 11 CPF digits."""
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+def format_phone(v: str) -> str:
+    """Check a phone number has an area code and return it formatted for display."""
+    # Remove non-numeric characters
+    phone = NON_DIGITS.sub('', v)
+    
+    # Check if phone number has at least 10 digits (area code + number)
+    if len(phone) < 10:
+        raise ValueError('Phone number must have at least 10 digits')
+    
+    return format_phone_digits(phone)
+
+def format_phone_digits(phone: str) -> str:
+    """Display form of a phone number's digits."""
+    # Format phone for display if it has 11 digits (with 9 prefix)
+    if len(phone) == 11:
+        return f"({phone[:2]}) {phone[2:7]}-{phone[7:]}"
+    # Format phone for display if it has 10 digits
+    elif len(phone) == 10:
+        return f"({phone[:2]}) {phone[2:6]}-{phone[6:]}"
+    
+    return phone
+
 class ClientBase(BaseModel):
     name: str
     email: EmailStr
@@ -16,58 +69,11 @@ class ClientBase(BaseModel):
 
     @validator('cpf')
     def cpf_validator(cls, v):
-        # Remove non-numeric characters
-        cpf = re.sub(r'[^0-9]', '', v)
-        
-        # Check if CPF has 11 digits
-        if len(cpf) != 11:
-            raise ValueError('CPF must have 11 digits')
-        
-        # Check if all digits are the same (invalid CPF)
-        if cpf == cpf[0] * 11:
-            raise ValueError('Invalid CPF')
-        
-        # Validate CPF algorithm
-        # Calculate first check digit
-        total = 0
-        for i in range(9):
-            total += int(cpf[i]) * (10 - i)
-        remainder = total % 11
-        check_digit_1 = 0 if remainder < 2 else 11 - remainder
-        
-        if int(cpf[9]) != check_digit_1:
-            raise ValueError('Invalid CPF')
-        
-        # Calculate second check digit
-        total = 0
-        for i in range(10):
-            total += int(cpf[i]) * (11 - i)
-        remainder = total % 11
-        check_digit_2 = 0 if remainder < 2 else 11 - remainder
-        
-        if int(cpf[10]) != check_digit_2:
-            raise ValueError('Invalid CPF')
-        
-        # Format CPF for display
-        return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+        return validate_cpf(v)
 
     @validator('phone')
     def phone_validator(cls, v):
-        # Remove non-numeric characters
-        phone = re.sub(r'[^0-9]', '', v)
-        
-        # Check if phone number has at least 10 digits (area code + number)
-        if len(phone) < 10:
-            raise ValueError('Phone number must have at least 10 digits')
-        
-        # Format phone for display if it has 11 digits (with 9 prefix)
-        if len(phone) == 11:
-            return f"({phone[:2]}) {phone[2:7]}-{phone[7:]}"
-        # Format phone for display if it has 10 digits
-        elif len(phone) == 10:
-            return f"({phone[:2]}) {phone[2:6]}-{phone[6:]}"
-        
-        return phone
+        return format_phone(v)
 
 class ClientCreate(ClientBase):
     pass
@@ -75,6 +81,7 @@ class ClientCreate(ClientBase):
 class ClientUpdate(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
+    cpf: Optional[str] = None
     phone: Optional[str] = None
     address: Optional[str] = None
     city: Optional[str] = None
@@ -82,6 +89,19 @@ class ClientUpdate(BaseModel):
     postal_code: Optional[str] = None
     is_active: Optional[bool] = None
 
+    @validator('name', 'email', 'cpf', 'phone')
+    def required_not_null(cls, v):
+        # May be left out of an update, but not cleared
+        if v is None:
+            raise ValueError('Field cannot be null')
+        return v
+
+    @validator('cpf')
+    def cpf_validator(cls, v):
+        if v is None:
+            return v
+        return validate_cpf(v)
+
     class Config:
         orm_mode = True
 
@@ -95,4 +115,20 @@ class ClientInDBBase(ClientBase):
         orm_mode = True
 
 class Client(ClientInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+# A bulk import row once its CPF and phone have been checked and formatted
+class ClientImportRow(BaseModel):
+    name: str
+    email: EmailStr
+    cpf: str
+    phone: str
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
+    is_active: Optional[bool] = True
+
+class ClientPage(BaseModel):
+    items: List[Client]
+    next_cursor: Optional[str] = None
@@ -82,3 +82,8 @@ class OrderInDBBase(OrderBase):
 # Final schema to be used in responses
 class Order(OrderInDBBase):
     pass
+
+# Page of orders returned in cursor (keyset) pagination mode
+class OrderPage(BaseModel):
+    items: List[Order]
+    next_cursor: Optional[str] = None
@@ -76,4 +76,8 @@ class ProductInDBBase(ProductBase):
         orm_mode = True
 
 class Product(ProductInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+class ProductPage(BaseModel):
+    items: List[Product]
+    next_cursor: Optional[str] = None
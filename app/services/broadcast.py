@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.models.broadcast import BroadcastJob, BroadcastRecipient, BroadcastStatus, RecipientStatus
+from app.models.client import Client
+from app.services.messaging import render_promotional_message, send_whatsapp_message, whatsapp_number
+from app.services.outbox import Sender, utcnow
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """
+    Spaces calls evenly so that at most `rate` of them start per second.
+    A rate of 0 or less disables the limit.
+    """
+
+    def __init__(self, rate: float, timer: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.timer = timer
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = self.timer()
+            slot = max(now, self._next)
+            self._next = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class BroadcastWorker:
+    """
+    Sends promotional broadcast jobs in the background.
+
+    A job is claimed with a lease on available_at that is renewed after every
+    batch, so if the process dies another worker resumes it once the lease runs
+    out. Only recipients still pending are sent, which means a crash can repeat
+    at most the batch that was in flight.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker,
+        send: Sender = send_whatsapp_message,
+        concurrency: int = settings.BROADCAST_CONCURRENCY,
+        rate: float = settings.BROADCAST_RATE_PER_SECOND,
+        batch_size: int = settings.BROADCAST_BATCH_SIZE,
+        poll_interval: float = settings.BROADCAST_POLL_INTERVAL_SECONDS,
+        claim_timeout: float = settings.BROADCAST_CLAIM_TIMEOUT_SECONDS,
+    ):
+        self.sessionmaker = sessionmaker
+        self.send = send
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.claim_timeout = claim_timeout
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def lease(self):
+        return utcnow() + timedelta(seconds=self.claim_timeout)
+
+    async def claim_job(self) -> Optional[str]:
+        async with self.sessionmaker() as db:
+            job = await db.scalar(
+                select(BroadcastJob)
+                .filter(
+                    BroadcastJob.status.in_([BroadcastStatus.PENDING, BroadcastStatus.RUNNING]),
+                    BroadcastJob.available_at <= utcnow(),
+                )
+                .order_by(BroadcastJob.available_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if not job:
+                return None
+            job.status = BroadcastStatus.RUNNING
+            job.available_at = self.lease()
+            job.started_at = job.started_at or utcnow()
+            await db.commit()
+            return job.id
+
+    async def deliver(self, job: BroadcastJob, client: Client, semaphore: asyncio.Semaphore) -> Optional[str]:
+        """Send to one client; returns an error message on failure."""
+        async with semaphore:
+            await self.limiter.acquire()
+            try:
+                await self.send(whatsapp_number(client.phone), render_promotional_message(client, job.message))
+            except Exception as e:
+                return str(e) or type(e).__name__
+        return None
+
+    async def run_batch(self, job_id: str) -> int:
+        """Send the next batch of pending recipients; returns how many were handled."""
+        async with self.sessionmaker() as db:
+            job = await db.get(BroadcastJob, job_id)
+            clients = (await db.scalars(
+                select(Client)
+                .join(BroadcastRecipient, BroadcastRecipient.client_id == Client.id)
+                .filter(
+                    BroadcastRecipient.job_id == job_id,
+                    BroadcastRecipient.status == RecipientStatus.PENDING,
+                )
+                .order_by(BroadcastRecipient.client_id)
+                .limit(self.batch_size)
+            )).all()
+            if not clients:
+                job.status = BroadcastStatus.COMPLETED
+                job.finished_at = utcnow()
+                await db.commit()
+                return 0
+
+        # Send without holding a database connection
+        semaphore = asyncio.Semaphore(self.concurrency)
+        errors = await asyncio.gather(*(self.deliver(job, client, semaphore) for client in clients))
+
+        async with self.sessionmaker() as db:
+            now = utcnow()
+            sent = [client.id for client, error in zip(clients, errors) if error is None]
+            if sent:
+                await db.execute(
+                    update(BroadcastRecipient)
+                    .filter(BroadcastRecipient.job_id == job_id, BroadcastRecipient.client_id.in_(sent))
+                    .values(status=RecipientStatus.SENT, sent_at=now)
+                )
+            for client, error in zip(clients, errors):
+                if error is not None:
+                    await db.execute(
+                        update(BroadcastRecipient)
+                        .filter(BroadcastRecipient.job_id == job_id, BroadcastRecipient.client_id == client.id)
+                        .values(status=RecipientStatus.FAILED, error=error)
+                    )
+            await db.execute(
+                update(BroadcastJob)
+                .filter(BroadcastJob.id == job_id)
+                .values(
+                    sent=BroadcastJob.sent + len(sent),
+                    failed=BroadcastJob.failed + len(clients) - len(sent),
+                    available_at=self.lease(),
+                )
+            )
+            await db.commit()
+        return len(clients)
+
+    async def run_job(self, job_id: str) -> None:
+        while not self._stopping.is_set() and await self.run_batch(job_id):
+            pass
+
+    async def run_once(self) -> bool:
+        """Claim one job and send it to completion; returns False when idle."""
+        job_id = await self.claim_job()
+        if not job_id:
+            return False
+        await self.run_job(job_id)
+        return True
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                busy = await self.run_once()
+            except Exception:
+                logger.exception("Broadcast worker iteration failed")
+                busy = False
+            if not busy:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
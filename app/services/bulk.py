@@ -0,0 +1,194 @@
+import codecs
+import csv
+import json
+import tempfile
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+
+FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "ndjson",
+}
+
+def detect_format(content_type: Optional[str], fmt: Optional[str] = None) -> str:
+    """Input format from an explicit format parameter or the Content-Type header."""
+    if fmt:
+        if fmt not in ("csv", "ndjson"):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Format must be csv or ndjson")
+        return fmt
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson",
+        )
+    return FORMATS[media_type]
+
+async def spool_body(request: Request, max_memory: int = 1024 * 1024) -> tempfile.SpooledTemporaryFile:
+    """
+    Copy the request body to a temporary file that moves to disk past
+    max_memory bytes. Needed when the response streams while the body is
+    read, since a streaming response consumes the receive channel.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    async for chunk in request.stream():
+        await run_in_threadpool(spool.write, chunk)
+    spool.seek(0)
+    return spool
+
+async def iter_file(file, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    while chunk := await run_in_threadpool(file.read, chunk_size):
+        yield chunk
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream into lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending.rstrip("\r"):
+        yield pending.rstrip("\r")
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row number, record, parse error) for each CSV or NDJSON row.
+    CSV rows are numbered from the first line after the header.
+    """
+    header: Optional[List[str]] = None
+    record = ""
+    row = 0
+    async for line in iter_lines(chunks):
+        if fmt == "ndjson":
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                yield row, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(value, dict):
+                yield row, None, "Each line must be a JSON object"
+                continue
+            yield row, value, None
+            continue
+
+        # A quoted CSV field may span lines: wait for the closing quote
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        line, record = record, ""
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells fall back to the schema defaults
+        yield row, {name: value for name, value in zip(header, values) if value != ""}, None
+    if record:
+        yield row + 1, None, "Unterminated quoted field"
+
+def validation_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    ]
+
+class BulkReport:
+    """
+    Counts, per-row errors and superseded rows of a bulk import. Only the
+    first BULK_MAX_ERRORS of each list are kept.
+    """
+
+    def __init__(self, max_errors: int = settings.BULK_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.received = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.superseded = 0
+        self.errors: List[dict] = []
+        self.superseded_rows: List[dict] = []
+
+    def error(self, row: int, key: Optional[str], errors: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "key": key, "errors": errors})
+
+    def supersede(self, row: int, key: str, by: int) -> None:
+        """Row `row` was valid but a later row `by` with the same key replaced it."""
+        self.superseded += 1
+        if len(self.superseded_rows) < self.max_errors:
+            self.superseded_rows.append({"row": row, "key": key, "superseded_by": by})
+
+    def totals(self) -> dict:
+        return {
+            "received": self.received,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "superseded": self.superseded,
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            **self.totals(),
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "superseded_rows": self.superseded_rows,
+            "superseded_truncated": self.superseded > len(self.superseded_rows),
+        }
+
+async def iter_valid_batches(
+    records: AsyncIterator[Tuple[int, Optional[dict], Optional[str]]],
+    schema: Type[BaseModel],
+    key: str,
+    report: BulkReport,
+    batch_size: int = settings.BULK_BATCH_SIZE,
+) -> AsyncIterator[Dict[str, Tuple[int, BaseModel]]]:
+    """
+    Validate records against schema and yield batches keyed by `key`.
+    Within a batch a later row with the same key replaces the earlier one,
+    which is reported as superseded.
+    """
+    batch: Dict[str, Tuple[int, BaseModel]] = {}
+    async for row, record, parse_error in records:
+        report.received += 1
+        if parse_error:
+            report.error(row, None, [parse_error])
+            continue
+        record_key = record.get(key)
+        record_key = str(record_key).strip() if record_key not in (None, "") else None
+        if not record_key:
+            report.error(row, None, [f"{key}: field required"])
+            continue
+        try:
+            item = schema(**{**record, key: record_key})
+        except ValidationError as e:
+            report.error(row, record_key, validation_errors(e))
+            continue
+        if record_key in batch:
+            report.supersede(batch[record_key][0], record_key, row)
+        batch[record_key] = (row, item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = {}
+    if batch:
+        yield batch
@@ -0,0 +1,133 @@
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import VersionedResponseCache
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.product import Product
+from app.schemas.product import ProductCreate
+from app.services.bulk import BulkReport, iter_valid_batches
+
+# Serialized GET /products responses; every product or stock change invalidates it
+product_cache = VersionedResponseCache(
+    "products", settings.PRODUCT_CACHE_SIZE, settings.PRODUCT_CACHE_TTL_SECONDS
+)
+
+Records = AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]
+
+# Columns written by the bulk import; images are managed per product
+PRODUCT_COLUMNS = ["description", "price", "barcode", "section", "stock", "expiration_date", "is_active"]
+UPDATE_COLUMNS = [column for column in PRODUCT_COLUMNS if column != "barcode"]
+
+def present_columns(item: ProductCreate) -> Tuple[str, ...]:
+    """
+    Update columns the row actually gives. Columns missing from the file, or
+    left empty in a CSV row, keep the current value of an existing product.
+    """
+    given = item.dict(exclude_unset=True)
+    return tuple(column for column in UPDATE_COLUMNS if column in given)
+
+async def upsert_products(db: AsyncSession, records: Records, user_id: str, report: BulkReport) -> None:
+    """
+    Insert or update products by barcode, one commit per batch and one
+    statement per set of columns present in its rows.
+    """
+    dialect = db.get_bind().dialect.name
+    statements = {}
+    # Last row written for each barcode, so a repeat in a later batch
+    # supersedes it, as the COPY path reports it
+    last_rows: Dict[str, int] = {}
+    async for batch in iter_valid_batches(records, ProductCreate, "barcode", report):
+        existing = set(await db.scalars(select(Product.barcode).filter(Product.barcode.in_(batch))))
+        groups = defaultdict(list)
+        for _, item in batch.values():
+            groups[present_columns(item)].append(
+                {**item.dict(include=set(PRODUCT_COLUMNS)), "created_by": user_id}
+            )
+        for columns, rows in groups.items():
+            if columns not in statements:
+                statements[columns] = upsert(dialect, Product, ["barcode"], columns, {"updated_at": func.now()})
+            await db.execute(statements[columns], rows)
+        await db.commit()
+        for barcode, (row, _) in batch.items():
+            if barcode in last_rows:
+                # This row takes over the created or updated count of the one it replaced
+                report.supersede(last_rows[barcode], barcode, row)
+            elif barcode in existing:
+                report.updated += 1
+            else:
+                report.created += 1
+            last_rows[barcode] = row
+
+STAGING_COLUMNS = ["row_no", *PRODUCT_COLUMNS, "present"]
+
+CREATE_STAGING = """
+CREATE TEMP TABLE products_staging (
+    row_no integer,
+    description text,
+    price double precision,
+    barcode text,
+    section text,
+    stock integer,
+    expiration_date date,
+    is_active boolean,
+    present text
+) ON COMMIT DROP
+"""
+
+# The last row for each barcode wins, as in the batched path. Run once per
+# set of present columns (comma-separated), which are the only ones updated.
+MERGE_STAGING = f"""
+INSERT INTO products (id, {", ".join(PRODUCT_COLUMNS)}, created_by)
+SELECT gen_random_uuid()::text, {", ".join(PRODUCT_COLUMNS)}, :created_by
+FROM (
+    SELECT DISTINCT ON (barcode) * FROM products_staging ORDER BY barcode, row_no DESC
+) AS staged
+WHERE present = :present
+ON CONFLICT (barcode) DO UPDATE SET
+    {{}},
+    updated_at = now()
+RETURNING (xmax = 0) AS inserted
+"""
+
+# Staged rows replaced by a later row with the same barcode in another batch
+SUPERSEDED_STAGING = """
+SELECT row_no, barcode, last_row FROM (
+    SELECT row_no, barcode, max(row_no) OVER (PARTITION BY barcode) AS last_row FROM products_staging
+) AS staged
+WHERE row_no < last_row
+ORDER BY row_no
+"""
+
+async def copy_products(db: AsyncSession, records: Records, user_id: str, report: BulkReport) -> None:
+    """
+    PostgreSQL only: COPY validated rows into a temporary staging table, then
+    merge it into products with one INSERT ... ON CONFLICT per set of present
+    columns, in one transaction.
+    """
+    await db.execute(text(CREATE_STAGING))
+    connection = await (await db.connection()).get_raw_connection()
+    async for batch in iter_valid_batches(records, ProductCreate, "barcode", report):
+        await connection.driver_connection.copy_records_to_table(
+            "products_staging",
+            columns=STAGING_COLUMNS,
+            records=[
+                (row, *(getattr(item, column) for column in PRODUCT_COLUMNS), ",".join(present_columns(item)))
+                for row, item in batch.values()
+            ],
+        )
+
+    for row, barcode, last_row in (await db.execute(text(SUPERSEDED_STAGING))).all():
+        report.supersede(row, barcode, last_row)
+    inserted = []
+    for present in (await db.scalars(text("SELECT DISTINCT present FROM products_staging"))).all():
+        statement = MERGE_STAGING.format(
+            ", ".join(f"{column} = EXCLUDED.{column}" for column in present.split(","))
+        )
+        inserted += (await db.scalars(text(statement), {"created_by": user_id, "present": present})).all()
+    await db.commit()
+    report.created += sum(inserted)
+    report.updated += len(inserted) - sum(inserted)
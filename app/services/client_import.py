@@ -0,0 +1,173 @@
+import re
+from operator import mul
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.upsert import insert_ignore
+from app.models.client import Client, normalize_cpf
+from app.schemas.client import NON_DIGITS, ClientImportRow, format_cpf, format_phone_digits
+from app.services.bulk import BulkReport, validation_errors
+
+Records = AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]
+
+NON_DIGITS_OR_NEWLINE = re.compile(r"[^0-9\n]")
+
+# CPF check digit weights, and the weighted sum of ASCII '0's to subtract
+# when the digits are summed as bytes
+CPF_WEIGHTS = [tuple(range(size + 1, 1, -1)) for size in (9, 10)]
+CPF_OFFSETS = [ord("0") * sum(weights) for weights in CPF_WEIGHTS]
+
+def column_digits(values: List[str]) -> List[str]:
+    """Digits-only form of every value, from one regex pass over the joined column."""
+    digits = NON_DIGITS_OR_NEWLINE.sub("", "\n".join(values)).split("\n")
+    if len(digits) != len(values):
+        # A value held a line break of its own
+        digits = [NON_DIGITS.sub("", value) for value in values]
+    return digits
+
+def check_column(
+    values: List[Optional[str]],
+    field: str,
+    check: Callable[[str], Optional[str]],
+    display: Callable[[str], str],
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Check a whole column at once; returns (formatted value, error) pairs.
+    check gets each value's digits and returns an error message or None.
+    """
+    present = [str(value) for value in values if value]
+    digits = iter(column_digits(present))
+    results = []
+    for value in values:
+        if not value:
+            results.append((None, f"{field}: field required"))
+            continue
+        number = next(digits)
+        error = check(number)
+        results.append((None, f"{field}: {error}") if error else (display(number), None))
+    return results
+
+def cpf_error(cpf: str) -> Optional[str]:
+    """validate_cpf's checks, with check digits summed over the ASCII bytes."""
+    if len(cpf) != 11:
+        return "CPF must have 11 digits"
+    if cpf == cpf[0] * 11:
+        return "Invalid CPF"
+    data = cpf.encode()
+    for position, weights, offset in zip((9, 10), CPF_WEIGHTS, CPF_OFFSETS):
+        remainder = (sum(map(mul, weights, data)) - offset) % 11
+        if int(cpf[position]) != (0 if remainder < 2 else 11 - remainder):
+            return "Invalid CPF"
+    return None
+
+def phone_error(phone: str) -> Optional[str]:
+    return "Phone number must have at least 10 digits" if len(phone) < 10 else None
+
+def check_cpfs(values: List[Optional[str]]) -> List[Tuple[Optional[str], Optional[str]]]:
+    return check_column(values, "cpf", cpf_error, format_cpf)
+
+def check_phones(values: List[Optional[str]]) -> List[Tuple[Optional[str], Optional[str]]]:
+    return check_column(values, "phone", phone_error, format_phone_digits)
+
+class ClientImporter:
+    """
+    Validates, deduplicates and inserts client rows in batches, yielding one
+    result per row. CPF and phone are checked for the whole batch first, a
+    column at a time; the rest of each row is validated by ClientImportRow.
+    Duplicates are then found with one query per batch against the database
+    and with in-memory sets against earlier rows of the same file.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: str, batch_size: int = settings.BULK_BATCH_SIZE):
+        self.db = db
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.report = BulkReport(max_errors=0)
+        self.insert = insert_ignore(db.get_bind().dialect.name, Client).returning(Client.id, Client.cpf_normalized)
+        # First row of the file that used each CPF / email
+        self.seen_cpfs: Dict[str, int] = {}
+        self.seen_emails: Dict[str, int] = {}
+
+    def error(self, row: int, key: Optional[str], errors: List[str]) -> dict:
+        self.report.error(row, key, errors)
+        return {"row": row, "status": "error", "key": key, "errors": errors}
+
+    async def run(self, records: Records) -> AsyncIterator[dict]:
+        batch: List[Tuple[int, dict]] = []
+        async for row, record, parse_error in records:
+            self.report.received += 1
+            if parse_error:
+                yield self.error(row, None, [parse_error])
+                continue
+            batch.append((row, record))
+            if len(batch) >= self.batch_size:
+                for result in await self.import_batch(batch):
+                    yield result
+                batch = []
+        if batch:
+            for result in await self.import_batch(batch):
+                yield result
+
+    async def import_batch(self, batch: List[Tuple[int, dict]]) -> List[dict]:
+        results: Dict[int, dict] = {}
+        cpfs = check_cpfs([record.get("cpf") for _, record in batch])
+        phones = check_phones([record.get("phone") for _, record in batch])
+
+        valid: Dict[str, Tuple[int, ClientImportRow]] = {}
+        for (row, record), (cpf, cpf_error), (phone, phone_error) in zip(batch, cpfs, phones):
+            key = normalize_cpf(cpf) if cpf else None
+            if cpf_error or phone_error:
+                results[row] = self.error(row, key, [error for error in (cpf_error, phone_error) if error])
+                continue
+            try:
+                item = ClientImportRow(**{**record, "cpf": cpf, "phone": phone})
+            except ValidationError as e:
+                results[row] = self.error(row, key, validation_errors(e))
+                continue
+            if key in self.seen_cpfs:
+                results[row] = self.error(row, key, [f"Duplicate CPF in file (row {self.seen_cpfs[key]})"])
+                continue
+            if item.email in self.seen_emails:
+                results[row] = self.error(row, key, [f"Duplicate email in file (row {self.seen_emails[item.email]})"])
+                continue
+            self.seen_cpfs[key] = row
+            self.seen_emails[item.email] = row
+            valid[key] = (row, item)
+
+        if valid:
+            # Existing clients with any of the batch's CPFs or emails, in one query
+            emails = {item.email: key for key, (_, item) in valid.items()}
+            for email, cpf_normalized in (await self.db.execute(
+                select(Client.email, Client.cpf_normalized)
+                .filter(or_(Client.cpf_normalized.in_(valid), Client.email.in_(emails)))
+            )).all():
+                for key, message in ((cpf_normalized, "CPF already registered"), (emails.get(email), "Email already registered")):
+                    if key in valid:
+                        row, _ = valid.pop(key)
+                        results[row] = self.error(row, key, [message])
+
+        if valid:
+            inserted = {
+                cpf_normalized: client_id
+                for client_id, cpf_normalized in (await self.db.execute(
+                    self.insert,
+                    [
+                        {**item.dict(), "cpf_normalized": key, "created_by": self.user_id}
+                        for key, (_, item) in valid.items()
+                    ],
+                )).all()
+            }
+            await self.db.commit()
+            for key, (row, _) in valid.items():
+                if key in inserted:
+                    self.report.created += 1
+                    results[row] = {"row": row, "status": "created", "key": key, "id": inserted[key]}
+                else:
+                    # Lost a race with a concurrent insert of the same CPF or email
+                    results[row] = self.error(row, key, ["CPF or email already registered"])
+
+        return [results[row] for row in sorted(results)]
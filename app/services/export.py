@@ -0,0 +1,56 @@
+import csv
+import enum
+import io
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def export_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+async def iter_export(
+    db: AsyncSession, query: Select, fmt: str, batch_size: int = settings.EXPORT_BATCH_SIZE
+) -> AsyncIterator[str]:
+    """
+    Encode the rows of a column query as NDJSON or CSV, reading them from a
+    server-side cursor batch_size rows at a time.
+    """
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    columns: List[str] = list(result.keys())
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+    async for rows in result.partitions():
+        if fmt == "csv":
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([export_value(value) for value in row] for row in rows)
+            yield buffer.getvalue()
+        else:
+            # orjson writes enums by value and datetimes in ISO format itself
+            yield b"".join(
+                orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE) for row in rows
+            ).decode()
+
+def export_response(db: AsyncSession, query: Select, fmt: str, name: str) -> StreamingResponse:
+    # The session dependency stays open until the response has been sent
+    return StreamingResponse(
+        iter_export(db, query, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
@@ -0,0 +1,173 @@
+import asyncio
+import random
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import whatsapp_send_duration
+from app.models.client import Client
+from app.models.order import Order, OrderStatus
+
+class MessagingError(Exception):
+    """A message could not be delivered by the provider."""
+
+class MessagingProvider:
+    """
+    Sends WhatsApp messages. Implementations keep their connections open
+    between calls and release them in aclose().
+    """
+
+    async def send(self, phone_number: str, message: str) -> dict:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+class TwilioProvider(MessagingProvider):
+    """
+    Twilio Messages API over one pooled, keep-alive HTTP client.
+    """
+
+    def __init__(
+        self,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
+        timeout: float = settings.MESSAGING_TIMEOUT_SECONDS,
+        max_connections: int = settings.MESSAGING_MAX_CONNECTIONS,
+        keepalive_expiry: float = settings.MESSAGING_KEEPALIVE_SECONDS,
+        base_url: str = "https://api.twilio.com/2010-04-01",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.account_sid = account_sid
+        self.from_number = from_number
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            auth=(account_sid, auth_token),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+    async def send(self, phone_number: str, message: str) -> dict:
+        try:
+            response = await self.client.post(
+                f"/Accounts/{self.account_sid}/Messages.json",
+                data={"From": self.from_number, "To": f"whatsapp:+{phone_number}", "Body": message},
+            )
+        except httpx.HTTPError as e:
+            raise MessagingError(f"Twilio request failed: {e!r}") from e
+        if response.is_error:
+            try:
+                detail = response.json().get("message")
+            except ValueError:
+                detail = None
+            raise MessagingError(f"Twilio returned {response.status_code}: {detail or response.text}")
+
+        data = response.json()
+        return {"sid": data.get("sid"), "status": data.get("status"), "to": data.get("to"), "message": message}
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+class FakeProvider(MessagingProvider):
+    """
+    In-process provider for tests and benchmarks: waits `latency` seconds
+    per message and fails a `failure_rate` fraction of them.
+    """
+
+    def __init__(
+        self,
+        latency: float = settings.FAKE_MESSAGING_LATENCY_SECONDS,
+        failure_rate: float = settings.FAKE_MESSAGING_FAILURE_RATE,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.sent: List[Tuple[str, str]] = []
+
+    async def send(self, phone_number: str, message: str) -> dict:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.random.random() < self.failure_rate:
+            raise MessagingError("Fake provider failure")
+        self.sent.append((phone_number, message))
+        return {"sid": f"FAKE{len(self.sent):08d}", "status": "queued", "to": f"whatsapp:+{phone_number}", "message": message}
+
+_provider: Optional[MessagingProvider] = None
+
+def get_provider() -> MessagingProvider:
+    """The process-wide provider selected by MESSAGING_PROVIDER."""
+    global _provider
+    if _provider is None:
+        if settings.MESSAGING_PROVIDER == "fake":
+            _provider = FakeProvider()
+        elif settings.MESSAGING_PROVIDER == "twilio":
+            if not all([settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, settings.TWILIO_WHATSAPP_NUMBER]):
+                raise MessagingError("Twilio is not properly configured.")
+            _provider = TwilioProvider(
+                settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, settings.TWILIO_WHATSAPP_NUMBER
+            )
+        else:
+            raise MessagingError(f"Unknown messaging provider: {settings.MESSAGING_PROVIDER}")
+    return _provider
+
+def set_provider(provider: Optional[MessagingProvider]) -> None:
+    """Replace the process-wide provider (tests and benchmarks)."""
+    global _provider
+    _provider = provider
+
+async def close_provider() -> None:
+    global _provider
+    if _provider is not None:
+        await _provider.aclose()
+        _provider = None
+
+async def send_whatsapp_message(phone_number: str, message: str) -> dict:
+    """
+    Send one message through the configured provider, recording its
+    latency. Raises MessagingError when it cannot be delivered.
+    """
+    outcome = "error"
+    start = time.perf_counter()
+    try:
+        result = await get_provider().send(phone_number, message)
+        outcome = "sent"
+        return result
+    finally:
+        whatsapp_send_duration.observe(time.perf_counter() - start, settings.MESSAGING_PROVIDER, outcome)
+
+def whatsapp_number(phone: str) -> str:
+    """Digits-only phone number with the Brazilian country code."""
+    phone_number = ''.join(filter(str.isdigit, phone))
+    if not phone_number.startswith('55'):
+        phone_number = f"55{phone_number}"
+    return phone_number
+
+def render_order_notification(
+    client: Client, order: Order, order_status: OrderStatus, status_change: bool = False
+) -> str:
+    if status_change:
+        return (
+            f"Hello {client.name},\n\n"
+            f"The status of your order #{order.id[:8]} has been updated to: {order_status.upper()}.\n"
+            f"Total amount: R$ {order.total_amount:.2f}\n\n"
+            f"Thank you for choosing Lu Estilo!"
+        )
+    return (
+        f"Hello {client.name},\n\n"
+        f"We have received your order #{order.id[:8]}!\n"
+        f"Current status: {order_status.upper()}\n"
+        f"Total amount: R$ {order.total_amount:.2f}\n\n"
+        f"Thanks for your preference!\nLu Estilo"
+    )
+
+def render_promotional_message(client: Client, message: str) -> str:
+    return f"Hello {client.name},\n\n{message}\n\nBest regards,\nLu Estilo"
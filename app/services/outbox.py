@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.client import Client
+from app.models.notification import NotificationKind, NotificationOutbox, OutboxStatus
+from app.models.order import Order
+from app.services.messaging import render_order_notification, send_whatsapp_message, whatsapp_number
+
+logger = logging.getLogger(__name__)
+
+Sender = Callable[[str, str], Awaitable[dict]]
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def enqueue_order_notification(
+    db: AsyncSession, order: Order, kind: NotificationKind = NotificationKind.ORDER_CREATED
+) -> NotificationOutbox:
+    """
+    Add an outbox row for the order to the current transaction.
+    It is only delivered if the transaction commits.
+    """
+    notification = NotificationOutbox(kind=kind, order=order, order_status=order.status)
+    db.add(notification)
+    return notification
+
+async def outbox_stats(db: AsyncSession) -> dict:
+    """Queue depth per status and the age of the oldest pending notification."""
+    counts = dict(
+        (await db.execute(
+            select(NotificationOutbox.status, func.count())
+            .filter(NotificationOutbox.status != OutboxStatus.SENT)
+            .group_by(NotificationOutbox.status)
+        )).all()
+    )
+    oldest = await db.scalar(
+        select(func.min(NotificationOutbox.created_at))
+        .filter(NotificationOutbox.status == OutboxStatus.PENDING)
+    )
+    return {
+        "pending": counts.get(OutboxStatus.PENDING, 0),
+        "failed": counts.get(OutboxStatus.FAILED, 0),
+        "oldest_pending_at": oldest,
+        "lag_seconds": round((utcnow() - as_utc(oldest)).total_seconds(), 3) if oldest else 0.0,
+    }
+
+class OutboxWorker:
+    """
+    Drains the notification outbox in batches.
+
+    Each batch is claimed by pushing available_at forward by a lease, so
+    other workers (in this or another process) skip it and a crash only
+    delays delivery until the lease runs out. Failed sends are retried with
+    exponential backoff and jitter until max_attempts is reached.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker,
+        send: Sender = send_whatsapp_message,
+        workers: int = settings.OUTBOX_WORKERS,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        backoff_base: float = settings.OUTBOX_BACKOFF_BASE_SECONDS,
+        backoff_max: float = settings.OUTBOX_BACKOFF_MAX_SECONDS,
+        claim_timeout: float = settings.OUTBOX_CLAIM_TIMEOUT_SECONDS,
+    ):
+        self.sessionmaker = sessionmaker
+        self.send = send
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.claim_timeout = claim_timeout
+        self._claim_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def claim_batch(self) -> List[NotificationOutbox]:
+        now = utcnow()
+        # The lock stops this process's workers from claiming the same rows on
+        # databases without SKIP LOCKED (SQLite)
+        async with self._claim_lock, self.sessionmaker() as db:
+            rows = (await db.scalars(
+                select(NotificationOutbox)
+                .filter(
+                    NotificationOutbox.status == OutboxStatus.PENDING,
+                    NotificationOutbox.available_at <= now,
+                )
+                .order_by(NotificationOutbox.available_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not rows:
+                return []
+
+            lease = now + timedelta(seconds=self.claim_timeout)
+            await db.execute(
+                update(NotificationOutbox)
+                .filter(NotificationOutbox.id.in_([row.id for row in rows]))
+                .values(attempts=NotificationOutbox.attempts + 1, available_at=lease)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            for row in rows:
+                row.attempts += 1
+            return rows
+
+    async def deliver(self, notification: NotificationOutbox, orders: Dict[str, tuple]) -> Optional[str]:
+        """Send one notification; returns an error message on failure."""
+        if notification.order_id not in orders:
+            return "Order not found"
+        order, client = orders[notification.order_id]
+        message = render_order_notification(
+            client,
+            order,
+            notification.order_status,
+            status_change=notification.kind == NotificationKind.ORDER_STATUS_CHANGED,
+        )
+        try:
+            await self.send(whatsapp_number(client.phone), message)
+        except Exception as e:
+            return str(e) or type(e).__name__
+        return None
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of rows handled."""
+        batch = await self.claim_batch()
+        if not batch:
+            return 0
+
+        async with self.sessionmaker() as db:
+            # Orders and clients for the whole batch in one query
+            orders = {
+                order.id: (order, client)
+                for order, client in (await db.execute(
+                    select(Order, Client)
+                    .join(Client, Client.id == Order.client_id)
+                    .filter(Order.id.in_({row.order_id for row in batch}))
+                )).all()
+            }
+
+        # Send without holding a database connection
+        errors = await asyncio.gather(*(self.deliver(row, orders) for row in batch))
+
+        async with self.sessionmaker() as db:
+            now = utcnow()
+            sent = [row.id for row, error in zip(batch, errors) if error is None]
+            if sent:
+                await db.execute(
+                    update(NotificationOutbox)
+                    .filter(NotificationOutbox.id.in_(sent))
+                    .values(status=OutboxStatus.SENT, sent_at=now, last_error=None)
+                )
+            for notification, error in zip(batch, errors):
+                if error is None:
+                    continue
+                values = {"last_error": error}
+                if notification.attempts >= self.max_attempts or error == "Order not found":
+                    values.update(status=OutboxStatus.FAILED)
+                    logger.warning("Giving up on notification %s: %s", notification.id, error)
+                else:
+                    values.update(available_at=now + timedelta(seconds=self.backoff(notification.attempts)))
+                await db.execute(
+                    update(NotificationOutbox)
+                    .filter(NotificationOutbox.id == notification.id)
+                    .values(**values)
+                )
+            await db.commit()
+
+        return len(batch)
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                handled = await self.run_once()
+            except Exception:
+                logger.exception("Outbox worker iteration failed")
+                handled = 0
+            if handled < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.upsert import dialect_insert
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.sales_rollup import ALL_SECTIONS, SalesRollup
+
+GROUP_COLUMNS = {
+    "day": SalesRollup.day,
+    "section": SalesRollup.section,
+    "status": SalesRollup.status,
+}
+
+def utc_day(value: datetime) -> date:
+    # SQLite hands back naive datetimes; they are stored in UTC
+    return (value.astimezone(timezone.utc) if value.tzinfo else value).date()
+
+async def order_section_totals(db: AsyncSession, order_id: str) -> Dict[str, float]:
+    """Item totals of an order per product section, in one query."""
+    return dict((await db.execute(
+        select(Product.section, func.sum(OrderItem.total_price))
+        .join(Product, OrderItem.product_id == Product.id)
+        .filter(OrderItem.order_id == order_id)
+        .group_by(Product.section)
+    )).all())
+
+async def apply_sales_delta(
+    db: AsyncSession, day: date, status: OrderStatus, section_totals: Dict[str, float], sign: int = 1
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) one order from the rollup, in the
+    caller's transaction, with a single INSERT ... ON CONFLICT statement.
+    """
+    if not section_totals:
+        return
+    statement = dialect_insert(db.get_bind().dialect.name, SalesRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=["day", "section", "status"],
+        set_={
+            "order_count": SalesRollup.order_count + statement.excluded.order_count,
+            "total_amount": SalesRollup.total_amount + statement.excluded.total_amount,
+        },
+    )
+    await db.execute(
+        statement,
+        [
+            {"day": day, "section": section, "status": status, "order_count": sign, "total_amount": sign * total}
+            for section, total in [*section_totals.items(), (ALL_SECTIONS, sum(section_totals.values()))]
+        ],
+    )
+
+async def rebuild_sales_rollups(db: AsyncSession) -> int:
+    """
+    Recompute the whole rollup from orders and their items; returns the
+    number of rollup rows. Orders are streamed, only the groups are kept.
+    """
+    totals: Dict[Tuple[date, str, OrderStatus], List[float]] = defaultdict(lambda: [0, 0.0])
+    result = await db.stream(
+        select(Order.id, Order.created_at, Order.status, Product.section, func.sum(OrderItem.total_price))
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .join(Product, OrderItem.product_id == Product.id)
+        .group_by(Order.id, Order.created_at, Order.status, Product.section)
+        .order_by(Order.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    current_order = None
+    async for order_id, created_at, status, section, total in result:
+        group = totals[(utc_day(created_at), section, status)]
+        group[0] += 1
+        group[1] += total
+        # Rows of one order are adjacent; it counts once across its sections
+        if order_id != current_order:
+            current_order = order_id
+            all_sections = totals[(utc_day(created_at), ALL_SECTIONS, status)]
+            all_sections[0] += 1
+        all_sections[1] += total
+
+    await db.execute(delete(SalesRollup))
+    if totals:
+        await db.execute(
+            insert(SalesRollup),
+            [
+                {"day": day, "section": section, "status": status, "order_count": count, "total_amount": amount}
+                for (day, section, status), (count, amount) in totals.items()
+            ],
+        )
+    await db.commit()
+    return len(totals)
+
+async def sales_report(
+    db: AsyncSession,
+    group_by: List[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    section: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+) -> List[dict]:
+    """Order counts and revenue from the rollup, summed per group_by columns."""
+    columns = [GROUP_COLUMNS[name] for name in group_by]
+    query = select(
+        *columns,
+        func.sum(SalesRollup.order_count).label("orders"),
+        func.sum(SalesRollup.total_amount).label("total_amount"),
+    )
+    if start_date:
+        query = query.filter(SalesRollup.day >= start_date)
+    if end_date:
+        query = query.filter(SalesRollup.day <= end_date)
+    if section:
+        query = query.filter(SalesRollup.section == section)
+    elif "section" in group_by:
+        query = query.filter(SalesRollup.section != ALL_SECTIONS)
+    else:
+        # Per-section rows would count an order once per section it bought from
+        query = query.filter(SalesRollup.section == ALL_SECTIONS)
+    if status:
+        query = query.filter(SalesRollup.status == status)
+    if columns:
+        # Groups emptied by status changes and deletions are left out
+        query = query.group_by(*columns).having(func.sum(SalesRollup.order_count) != 0).order_by(*columns)
+
+    return [dict(row._mapping) for row in await db.execute(query)]
@@ -0,0 +1,62 @@
+import time
+
+from passlib.context import CryptContext
+from sqlalchemy import select
+
+from app.core import security
+from app.core.security import create_access_token, decode_access_token, pwd_context
+from app.models.user import User
+
+async def test_login_upgrades_outdated_password_hash(client, db):
+    weak_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("Secret123")
+    db.add(User(email="weak@example.com", username="weak", hashed_password=weak_hash))
+    await db.commit()
+
+    response = await client.post("/auth/login", data={"email": "weak@example.com", "password": "Secret123"})
+
+    assert response.status_code == 200
+    stored = await db.scalar(
+        select(User.hashed_password).filter(User.email == "weak@example.com").execution_options(populate_existing=True)
+    )
+    assert stored != weak_hash
+    assert not pwd_context.needs_update(stored)
+    assert pwd_context.verify("Secret123", stored)
+
+async def test_login_rejects_wrong_password(client, db):
+    db.add(User(email="user@example.com", username="user", hashed_password=pwd_context.hash("Secret123")))
+    await db.commit()
+
+    response = await client.post("/auth/login", data={"email": "user@example.com", "password": "Wrong1234"})
+
+    assert response.status_code == 401
+
+def count_jwt_decodes(monkeypatch):
+    calls = []
+    decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return calls
+
+def test_reused_token_skips_signature_verification(monkeypatch):
+    calls = count_jwt_decodes(monkeypatch)
+    token = create_access_token({"sub": "user-id"})
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    assert len(calls) == 1
+
+def test_cached_token_is_not_served_after_exp(monkeypatch):
+    calls = count_jwt_decodes(monkeypatch)
+    token = create_access_token({"sub": "user-id"})
+    payload = decode_access_token(token)
+
+    monkeypatch.setattr(security.time, "time", lambda: payload["exp"] + 1)
+    decode_access_token(token)
+
+    assert len(calls) == 2
@@ -0,0 +1,83 @@
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.broadcast import BroadcastJob, BroadcastStatus
+from app.models.client import Client
+from app.services.broadcast import BroadcastWorker, RateLimiter
+
+async def create_broadcast(client, auth_headers, db, make_cpf, clients=5):
+    db.add_all(
+        Client(name=f"Client {i}", email=f"c{i}@example.com", cpf=make_cpf(100000001 + i), phone=f"1199999000{i}")
+        for i in range(clients)
+    )
+    await db.commit()
+    response = await client.post(
+        "/whatsapp/send-promotional-message", headers=auth_headers, params={"message": "Sale!"}
+    )
+    assert response.status_code == 202
+    assert response.json()["total"] == clients
+    return response.json()["id"]
+
+def worker(engine, send, **kwargs):
+    return BroadcastWorker(async_sessionmaker(engine, expire_on_commit=False), send=send, rate=0, **kwargs)
+
+async def test_broadcast_runs_in_background_with_paginated_results(client, auth_headers, db, engine, make_cpf):
+    job_id = await create_broadcast(client, auth_headers, db, make_cpf)
+    sent = []
+
+    async def send(phone_number, message):
+        if phone_number.endswith("0"):
+            raise RuntimeError("invalid number")
+        sent.append(phone_number)
+
+    assert await worker(engine, send).run_once()
+
+    response = await client.get(f"/whatsapp/broadcasts/{job_id}", headers=auth_headers, params={"limit": 2})
+    body = response.json()
+    assert body["job"]["status"] == "completed"
+    assert (body["job"]["sent"], body["job"]["failed"]) == (4, 1)
+    assert len(body["items"]) == 2 and body["next_skip"] == 2
+
+    response = await client.get(f"/whatsapp/broadcasts/{job_id}", headers=auth_headers, params={"status": "failed"})
+    [failed] = response.json()["items"]
+    assert failed["error"] == "invalid number"
+    assert response.json()["next_skip"] is None
+
+async def test_interrupted_broadcast_resumes_pending_recipients_only(client, auth_headers, db, engine, make_cpf):
+    job_id = await create_broadcast(client, auth_headers, db, make_cpf)
+    sent = []
+
+    async def send(phone_number, message):
+        sent.append(phone_number)
+
+    first = worker(engine, send, batch_size=2, claim_timeout=0)
+    assert await first.claim_job() == job_id
+    await first.run_batch(job_id)  # the process dies after one batch
+
+    assert await worker(engine, send).run_once()
+
+    assert sorted(sent) == sorted(set(sent)) and len(sent) == 5
+    db.expire_all()
+    job = await db.get(BroadcastJob, job_id)
+    assert (job.status, job.sent) == (BroadcastStatus.COMPLETED, 5)
+
+async def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(rate=100)
+    start = time.monotonic()
+    for _ in range(11):
+        await limiter.acquire()
+    assert time.monotonic() - start >= 0.1
+
+async def test_section_broadcast_targets_each_buyer_once(client, auth_headers, seed):
+    await seed(orders=3, items_per_order=3)
+
+    response = await client.post(
+        "/whatsapp/send-promotional-message", headers=auth_headers, params={"message": "Sale!", "section": "shirts"}
+    )
+    assert response.status_code == 202 and response.json()["total"] == 1
+
+    response = await client.post(
+        "/whatsapp/send-promotional-message", headers=auth_headers, params={"message": "Sale!", "section": "hats"}
+    )
+    assert response.status_code == 404
@@ -0,0 +1,135 @@
+import json
+from datetime import date
+from functools import partial
+
+from sqlalchemy import select
+
+from app.models.product import Product
+from app.services import catalog
+from app.services.bulk import iter_valid_batches
+
+CSV = (
+    "barcode,description,price,section,stock,is_active\n"
+    "789001,\"Shirt, blue\",59.9,shirts,10,true\n"
+    "789002,\"Dress\nlong\",120,dresses,,false\n"
+    "789003,Broken,-1,shirts,5,true\n"
+    ",No barcode,10,shirts,1,true\n"
+    "789004,Extra,10\n"
+    "789005,Cap,25,hats,3,true\n"
+)
+
+async def chunks(body: str, size: int = 7):
+    data = body.encode()
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+async def test_csv_upsert_streams_rows_and_reports_errors(client, auth_headers, db):
+    db.add(Product(description="Old", price=1.0, barcode="789005", section="hats", stock=0))
+    await db.commit()
+
+    response = await client.post(
+        "/products/bulk",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+        content=chunks(CSV),
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["created"], report["updated"], report["failed"]) == (6, 2, 1, 3)
+    assert [(error["row"], error["key"]) for error in report["errors"]] == [(3, "789003"), (4, None), (5, None)]
+    assert report["errors"][0]["errors"] == ["price: Value error, Price must be positive"]
+
+    db.expire_all()
+    products = {p.barcode: p for p in (await db.scalars(select(Product))).all()}
+    assert sorted(products) == ["789001", "789002", "789005"]
+    assert products["789001"].description == "Shirt, blue"
+    assert (products["789002"].description, products["789002"].stock, products["789002"].is_active) == ("Dress\nlong", 0, False)
+    assert (products["789005"].description, products["789005"].price, products["789005"].stock) == ("Cap", 25.0, 3)
+
+async def test_ndjson_upsert_last_duplicate_wins(client, auth_headers, db):
+    lines = [
+        json.dumps({"barcode": "1", "description": "First", "price": 10, "section": "shirts"}),
+        "{not json",
+        json.dumps({"barcode": "1", "description": "Second", "price": 11, "section": "shirts"}),
+    ]
+    response = await client.post(
+        "/products/bulk",
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        content="\n".join(lines),
+    )
+
+    report = response.json()
+    assert (report["received"], report["created"], report["failed"]) == (3, 1, 1)
+    assert (await db.scalar(select(Product.description).filter(Product.barcode == "1"))) == "Second"
+
+async def test_replaced_duplicate_is_reported_as_superseded(client, auth_headers, db):
+    body = "\n".join([
+        "barcode,description,price,section",
+        "1,First,10,shirts",
+        "2,Other,12,hats",
+        "1,Second,11,shirts",
+        "1,Third,13,shirts",
+    ])
+    response = await client.post(
+        "/products/bulk", headers={**auth_headers, "Content-Type": "text/csv"}, content=body
+    )
+
+    report = response.json()
+    assert (report["received"], report["created"], report["updated"], report["failed"], report["superseded"]) == (4, 2, 0, 0, 2)
+    assert report["received"] == report["created"] + report["updated"] + report["failed"] + report["superseded"]
+    assert report["superseded_rows"] == [
+        {"row": 1, "key": "1", "superseded_by": 3},
+        {"row": 3, "key": "1", "superseded_by": 4},
+    ]
+    assert (await db.scalar(select(Product.description).filter(Product.barcode == "1"))) == "Third"
+
+async def test_duplicates_across_batches_are_superseded(client, auth_headers, db, monkeypatch):
+    monkeypatch.setattr(catalog, "iter_valid_batches", partial(iter_valid_batches, batch_size=2))
+    body = "\n".join([
+        "barcode,description,price,section",
+        "1,First,10,shirts",
+        "2,Other,12,hats",
+        "1,Second,11,shirts",
+    ])
+    response = await client.post(
+        "/products/bulk", headers={**auth_headers, "Content-Type": "text/csv"}, content=body
+    )
+
+    report = response.json()
+    # Same counts as the COPY path, which merges the whole file at once
+    assert (report["received"], report["created"], report["updated"], report["superseded"]) == (3, 2, 0, 1)
+    assert report["superseded_rows"] == [{"row": 1, "key": "1", "superseded_by": 3}]
+    assert (await db.scalar(select(Product.description).filter(Product.barcode == "1"))) == "Second"
+
+async def test_partial_columns_keep_the_rest_of_existing_products(client, auth_headers, db):
+    db.add(Product(
+        description="Old", price=1.0, barcode="789001", section="hats", stock=50,
+        expiration_date=date(2030, 1, 1), is_active=False,
+    ))
+    await db.commit()
+
+    body = "barcode,description,price,section\n789001,Price sync,9.5,hats\n789002,New,12,hats\n"
+    response = await client.post(
+        "/products/bulk", headers={**auth_headers, "Content-Type": "text/csv"}, content=body
+    )
+
+    report = response.json()
+    assert (report["created"], report["updated"]) == (1, 1)
+    db.expire_all()
+    products = {p.barcode: p for p in (await db.scalars(select(Product))).all()}
+    updated = products["789001"]
+    assert (updated.description, updated.price) == ("Price sync", 9.5)
+    assert (updated.stock, updated.expiration_date, updated.is_active) == (50, date(2030, 1, 1), False)
+    # New products still get the schema defaults
+    assert (products["789002"].stock, products["789002"].is_active) == (0, True)
+
+async def test_bulk_upsert_rejects_unknown_format_and_copy_off_postgres(client, auth_headers):
+    response = await client.post(
+        "/products/bulk", headers={**auth_headers, "Content-Type": "text/plain"}, content="x"
+    )
+    assert response.status_code == 415
+
+    response = await client.post(
+        "/products/bulk", params={"copy": True}, headers={**auth_headers, "Content-Type": "text/csv"}, content=CSV
+    )
+    assert response.status_code == 400
@@ -0,0 +1,89 @@
+import json
+
+from sqlalchemy import func, select
+
+from app.models.client import Client
+from app.services.client_import import ClientImporter
+
+async def post_import(client, auth_headers, body, **params):
+    response = await client.post(
+        "/clients/import", params=params, headers={**auth_headers, "Content-Type": "text/csv"}, content=body
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    *rows, summary = [json.loads(line) for line in response.text.splitlines()]
+    return rows, summary["summary"]
+
+async def test_import_validates_and_dedups_against_file_and_database(client, auth_headers, db, seed, make_cpf):
+    await seed()  # existing client with CPF 529.982.247-25
+    a, b = make_cpf(111444777), make_cpf(123123123)
+    body = "\n".join([
+        "name,email,cpf,phone,city",
+        f"Ana,ana@example.com,{a},11987654321,São Paulo",
+        "Bia,bia@example.com,111.111.111-11,11987654321,",
+        f"Caio,caio@example.com,{b},123,",
+        f"Ana again,ana2@example.com,{a[:3]}.{a[3:6]}.{a[6:9]}-{a[9:]},1132654321,",
+        f"Dani,ana@example.com,{make_cpf(222333444)},1132654321,",
+        "Old,old@example.com,52998224725,1132654321,",
+        f"Eva,not-an-email,{make_cpf(555666777)},1132654321,",
+        f"Fabi,client@example.com,{make_cpf(888999000)},1132654321,",
+    ])
+
+    rows, summary = await post_import(client, auth_headers, body)
+
+    assert summary == {"received": 8, "created": 1, "updated": 0, "failed": 7, "superseded": 0}
+    assert [(row["row"], row["status"]) for row in rows] == [(1, "created"), *((n, "error") for n in range(2, 9))]
+    errors = {row["row"]: row["errors"] for row in rows[1:]}
+    assert errors[2] == ["cpf: Invalid CPF"]
+    assert errors[3] == ["phone: Phone number must have at least 10 digits"]
+    assert errors[4] == ["Duplicate CPF in file (row 1)"]
+    assert errors[5] == ["Duplicate email in file (row 1)"]
+    assert errors[6] == ["CPF already registered"]
+    assert errors[7][0].startswith("email:")
+    assert errors[8] == ["Email already registered"]
+
+    ana = await db.scalar(select(Client).filter(Client.email == "ana@example.com"))
+    assert (ana.id, ana.cpf_normalized, ana.phone, ana.city) == (rows[0]["id"], a, "(11) 98765-4321", "São Paulo")
+
+async def test_import_batches_and_reports_errors_only(client, auth_headers, db, user, make_cpf):
+    body = "name,email,cpf,phone\n" + "".join(
+        f"Client {i},c{i}@example.com,{make_cpf(300000000 + i)},11987654321\n" for i in range(5)
+    ) + f"Dup,c0@example.com,{make_cpf(399999999)},11987654321\n"
+
+    rows, summary = await post_import(client, auth_headers, body, errors_only=True)
+
+    assert (summary["created"], summary["failed"]) == (5, 1)
+    assert [row["row"] for row in rows] == [6]
+    assert await db.scalar(select(func.count()).select_from(Client)) == 5
+
+async def test_importer_dedups_across_batches(db, user, make_cpf):
+    cpf = make_cpf(700000001)
+
+    async def records():
+        for row in range(1, 4):
+            yield row, {"name": "X", "email": f"x{row}@example.com", "cpf": cpf, "phone": "11987654321"}, None
+
+    importer = ClientImporter(db, user.id, batch_size=1)
+    results = [result async for result in importer.run(records())]
+
+    assert [result["status"] for result in results] == ["created", "error", "error"]
+
+def test_column_checks_match_the_row_validators(make_cpf):
+    from app.schemas.client import format_phone, validate_cpf
+    from app.services.client_import import check_cpfs, check_phones
+
+    def row_by_row(values, check, field):
+        results = []
+        for value in values:
+            try:
+                results.append((check(value), None) if value else (None, f"{field}: field required"))
+            except ValueError as e:
+                results.append((None, f"{field}: {e}"))
+        return results
+
+    cpfs = [make_cpf(n) for n in (111444777, 123123123, 100000000)]
+    cpfs += ["", None, "111.111.111-11", "529.982.247-26", "1234", "529.982\n.247-25", "52998224725"]
+    phones = ["11987654321", "(11) 3265-4321", "123", "", "1198765\n4321", "+55 11 98765-4321"]
+
+    assert check_cpfs(cpfs) == row_by_row(cpfs, validate_cpf, "cpf")
+    assert check_phones(phones) == row_by_row(phones, format_phone, "phone")
@@ -0,0 +1,131 @@
+import pytest
+import httpx
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.dependencies.database import Base, get_async_db, instrument_engine, recent_writers
+from app.core.security import create_access_token, principal_cache, token_cache
+from app.main import app
+from app.models.client import Client
+from app.models.order import Order, OrderItem
+from app.models.product import Product, ProductImage
+from app.models.user import User
+from app.services.catalog import product_cache
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    principal_cache.clear()
+    token_cache.clear()
+    product_cache.invalidate()
+    recent_writers.clear()
+
+@pytest.fixture
+async def engine():
+    """In-memory SQLite database shared by every session of a test."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    instrument_engine(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest.fixture
+async def db(engine):
+    sessionmaker = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_test_db():
+        async with sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = get_test_db
+    async with sessionmaker() as session:
+        yield session
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+async def client(db):
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+@pytest.fixture
+async def user(db):
+    user = User(email="admin@example.com", username="admin", hashed_password="-", is_admin=True)
+    db.add(user)
+    await db.commit()
+    return user
+
+@pytest.fixture
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.id})}"}
+
+@pytest.fixture
+def count_queries(engine):
+    """List that collects every SQL statement sent while the test runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+@pytest.fixture
+def max_queries(count_queries):
+    """
+    Context manager failing the test when the block sends more than
+    `limit` statements, e.g. `with max_queries(3): await client.get(...)`.
+    """
+    @contextmanager
+    def max_queries(limit: int):
+        start = len(count_queries)
+        yield
+        sent = count_queries[start:]
+        assert len(sent) <= limit, f"{len(sent)} queries sent, expected at most {limit}:\n" + "\n".join(sent)
+
+    return max_queries
+
+@pytest.fixture
+def make_cpf():
+    """Builds a valid CPF from a nine-digit number."""
+    def make_cpf(n: int) -> str:
+        digits = [int(d) for d in f"{n:09d}"]
+        for size in (9, 10):
+            total = sum(d * (size + 1 - i) for i, d in enumerate(digits))
+            digits.append(total * 10 % 11 % 10)
+        return "".join(map(str, digits))
+
+    return make_cpf
+
+@pytest.fixture
+def seed(db, user):
+    """Factory that inserts orders with items, and products with images."""
+    async def seed(orders: int = 0, products: int = 0, items_per_order: int = 3):
+        client = Client(name="Client", email="client@example.com", cpf="529.982.247-25", phone="(11) 99999-9999")
+        catalog = [
+            Product(
+                description=f"Product {i}", price=10.0, section="shirts", stock=100,
+                images=[ProductImage(image_url=f"https://img/{i}.png", is_primary=True)],
+            )
+            for i in range(max(products, items_per_order))
+        ]
+        db.add(client)
+        db.add_all(catalog)
+        await db.flush()
+        db.add_all(
+            Order(
+                client_id=client.id,
+                total_amount=10.0 * items_per_order,
+                created_by=user.id,
+                items=[
+                    OrderItem(product_id=product.id, quantity=1, unit_price=10.0, total_price=10.0)
+                    for product in catalog[:items_per_order]
+                ],
+            )
+            for _ in range(orders)
+        )
+        await db.commit()
+
+    return seed
@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from app.models.client import Client
+from app.models.order import Order
+from app.services.export import iter_export
+
+async def test_order_export_streams_ndjson_with_list_filters(client, auth_headers, seed):
+    await seed(orders=3, items_per_order=2)
+
+    response = await client.get("/orders/export", headers=auth_headers, params={"section": "shirts"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    orders = [json.loads(line) for line in response.text.splitlines()]
+    assert len(orders) == 3
+    assert orders[0]["status"] == "pending" and orders[0]["total_amount"] == 20.0
+
+    response = await client.get("/orders/export", headers=auth_headers, params={"section": "hats"})
+    assert response.text == ""
+
+async def test_product_and_client_exports_as_csv(client, auth_headers, db, seed, user):
+    await seed(products=4)
+    db.add(Client(name="Mine", email="mine@example.com", cpf="111.444.777-35", phone="(11) 98765-4321", created_by=user.id))
+    await db.commit()
+
+    response = await client.get("/products/export", headers=auth_headers, params={"format": "csv", "min_price": 5})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers["content-disposition"] == 'attachment; filename="products.csv"'
+    assert len(rows) == 4 and rows[0]["section"] == "shirts" and rows[0]["is_active"] == "True"
+
+    # Clients are scoped to the current user, like the list endpoint
+    response = await client.get("/clients/export", headers=auth_headers, params={"format": "csv"})
+    assert [row["name"] for row in csv.DictReader(io.StringIO(response.text))] == ["Mine"]
+
+async def test_export_reads_in_batches(db, seed):
+    await seed(orders=5)
+
+    chunks = [chunk async for chunk in iter_export(db, select(Order.id, Order.status), "ndjson", batch_size=2)]
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
@@ -0,0 +1,59 @@
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.models.client import Client
+from app.services.messaging import FakeProvider, MessagingError, TwilioProvider, set_provider
+
+async def test_twilio_provider_posts_messages_over_one_client():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if parse_qs(request.content.decode())["To"] == ["whatsapp:+550"]:
+            return httpx.Response(400, json={"message": "Invalid 'To' Phone Number"})
+        return httpx.Response(201, json={"sid": "SM1", "status": "queued", "to": "whatsapp:+5511999999999"})
+
+    provider = TwilioProvider("AC1", "token", "whatsapp:+14155238886", transport=httpx.MockTransport(handler))
+    result = await provider.send("5511999999999", "Hi")
+    with pytest.raises(MessagingError, match="Invalid 'To' Phone Number"):
+        await provider.send("550", "Hi")
+    await provider.aclose()
+
+    assert result == {"sid": "SM1", "status": "queued", "to": "whatsapp:+5511999999999", "message": "Hi"}
+    assert requests[0].url.path == "/2010-04-01/Accounts/AC1/Messages.json"
+    assert parse_qs(requests[0].content.decode()) == {
+        "From": ["whatsapp:+14155238886"], "To": ["whatsapp:+5511999999999"], "Body": ["Hi"],
+    }
+    assert requests[0].headers["Authorization"].startswith("Basic ")
+
+async def test_fake_provider_injects_failures():
+    provider = FakeProvider(latency=0, failure_rate=1.0)
+    with pytest.raises(MessagingError):
+        await provider.send("5511999999999", "Hi")
+
+    provider.failure_rate = 0.0
+    await provider.send("5511999999999", "Hi")
+    assert provider.sent == [("5511999999999", "Hi")]
+
+async def test_send_message_endpoint_uses_configured_provider(client, auth_headers, db, seed):
+    await seed()
+    client_id = await db.scalar(select(Client.id))
+    provider = FakeProvider(latency=0)
+    set_provider(provider)
+    try:
+        response = await client.post(
+            "/whatsapp/send-message", headers=auth_headers, json={"client_id": client_id, "message": "Hi"}
+        )
+        provider.failure_rate = 1.0
+        failed = await client.post(
+            "/whatsapp/send-message", headers=auth_headers, json={"client_id": client_id, "message": "Hi"}
+        )
+    finally:
+        set_provider(None)
+
+    assert response.status_code == 200
+    assert provider.sent == [("5511999999999", "Hi")]
+    assert failed.status_code == 500
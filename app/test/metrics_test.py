@@ -0,0 +1,35 @@
+from app.core.metrics import Histogram, http_request_duration, http_requests, registry, render
+
+async def test_requests_are_labelled_by_route_template(client, auth_headers, seed):
+    http_requests.clear()
+    http_request_duration.clear()
+    await seed(products=1)
+    product_id = (await client.get("/products/", headers=auth_headers)).json()[0]["id"]
+    await client.get(f"/products/{product_id}", headers=auth_headers)
+    await client.get("/products/missing-id", headers=auth_headers)
+    await client.get("/no/such/path")
+
+    body = (await client.get("/metrics")).text
+
+    assert 'http_requests_total{method="GET",route="/products/{product_id}",status="200"} 1.0' in body
+    assert 'http_requests_total{method="GET",route="/products/{product_id}",status="404"} 1.0' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1.0' in body
+    # Concrete ids never become label values
+    assert product_id not in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/products/{product_id}"} 2.0' in body
+    assert 'cache_hits_total{cache="products"}' in body
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_latency_seconds", "Test latency", ["route"], buckets=(0.1, 1.0))
+    registry.remove(histogram)
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, "/x")
+
+    assert [(name, labels.get("le"), value) for name, labels, value in histogram.samples()] == [
+        ("test_latency_seconds_bucket", "0.1", 1.0),
+        ("test_latency_seconds_bucket", "1.0", 3.0),
+        ("test_latency_seconds_bucket", "+Inf", 4.0),
+        ("test_latency_seconds_sum", None, 4.25),
+        ("test_latency_seconds_count", None, 4.0),
+    ]
+    assert "# TYPE http_requests_total counter" in render()
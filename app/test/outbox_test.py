@@ -0,0 +1,100 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.client import Client
+from app.models.notification import NotificationKind, NotificationOutbox, OutboxStatus
+from app.models.product import Product
+from app.services.outbox import OutboxWorker
+
+async def create_order(client, auth_headers, db, seed):
+    await seed(products=1, items_per_order=1)
+    client_id = await db.scalar(select(Client.id))
+    product_id = await db.scalar(select(Product.id))
+    response = await client.post("/orders/", headers=auth_headers, json={
+        "client_id": client_id,
+        "items": [{"product_id": product_id, "quantity": 1, "unit_price": 10.0}],
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+async def outbox(db):
+    db.expire_all()
+    return (await db.scalars(select(NotificationOutbox))).all()
+
+async def test_order_creation_enqueues_notification_and_worker_sends_it(client, auth_headers, db, seed, engine):
+    order_id = await create_order(client, auth_headers, db, seed)
+    [notification] = await outbox(db)
+    assert (notification.order_id, notification.status) == (order_id, OutboxStatus.PENDING)
+
+    sent = []
+
+    async def send(phone_number, message):
+        sent.append((phone_number, message))
+        return {"status": "queued"}
+
+    worker = OutboxWorker(async_sessionmaker(engine, expire_on_commit=False), send=send)
+    assert await worker.run_once() == 1
+    assert await worker.run_once() == 0
+
+    [notification] = await outbox(db)
+    assert notification.status == OutboxStatus.SENT
+    assert notification.sent_at is not None
+    assert sent == [("5511999999999", sent[0][1])]
+    assert f"order #{order_id[:8]}" in sent[0][1]
+
+async def test_failed_sends_back_off_then_give_up(client, auth_headers, db, seed, engine):
+    await create_order(client, auth_headers, db, seed)
+
+    async def send(phone_number, message):
+        raise RuntimeError("provider unavailable")
+
+    worker = OutboxWorker(
+        async_sessionmaker(engine, expire_on_commit=False),
+        send=send, max_attempts=2, backoff_base=0,
+    )
+    await worker.run_once()
+    [notification] = await outbox(db)
+    assert (notification.status, notification.attempts) == (OutboxStatus.PENDING, 1)
+    assert notification.last_error == "provider unavailable"
+
+    await worker.run_once()
+    [notification] = await outbox(db)
+    assert (notification.status, notification.attempts) == (OutboxStatus.FAILED, 2)
+
+async def test_sends_run_with_no_session_open(client, auth_headers, db, seed, engine):
+    await create_order(client, auth_headers, db, seed)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    open_sessions = []
+
+    @asynccontextmanager
+    async def tracked_session():
+        async with sessionmaker() as session:
+            open_sessions.append(session)
+            try:
+                yield session
+            finally:
+                open_sessions.remove(session)
+
+    async def send(phone_number, message):
+        # A failed assertion is recorded as a delivery error
+        assert open_sessions == [], "connection held while sending"
+        return {}
+
+    await OutboxWorker(tracked_session, send=send).run_once()
+    [notification] = await outbox(db)
+    assert notification.status == OutboxStatus.SENT, notification.last_error
+
+async def test_status_change_enqueues_notification(client, auth_headers, db, seed):
+    order_id = await create_order(client, auth_headers, db, seed)
+
+    await client.put(f"/orders/{order_id}", headers=auth_headers, json={"notes": "gift"})
+    await client.put(f"/orders/{order_id}", headers=auth_headers, json={"status": "shipped"})
+
+    kinds = sorted(notification.kind for notification in await outbox(db))
+    assert kinds == [NotificationKind.ORDER_CREATED, NotificationKind.ORDER_STATUS_CHANGED]
+
+    response = await client.get("/whatsapp/outbox", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["pending"] == 2
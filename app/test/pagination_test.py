@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import select, text
+
+from app.models.client import Client
+from app.models.order import Order, OrderStatus
+from app.models.product import Product
+
+async def spread_created_at(db, table: str, ids):
+    """Give rows three to a second, in the text form SQLite's CURRENT_TIMESTAMP stores."""
+    for i, row_id in enumerate(ids):
+        await db.execute(
+            text(f"UPDATE {table} SET created_at = :created_at WHERE id = :id"),
+            {"created_at": f"2026-01-01 10:00:{i // 3:02d}", "id": row_id},
+        )
+    await db.commit()
+
+async def follow_cursor(client, auth_headers, path, params):
+    ids, cursor = [], ""
+    for _ in range(50):
+        response = await client.get(path, headers=auth_headers, params={**params, "cursor": cursor, "limit": 2})
+        assert response.status_code == 200
+        page = response.json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+    pytest.fail("next_cursor never ran out")
+
+async def list_ids(client, auth_headers, path, params, limit=1000):
+    response = await client.get(path, headers=auth_headers, params={**params, "limit": limit})
+    return [item["id"] for item in response.json()]
+
+async def seed_pages(db, seed, user, make_cpf):
+    await seed(orders=10, products=10, items_per_order=1)
+    db.add_all([Product(description=f"Hat {i}", price=30.0, section="hats") for i in range(3)])
+    db.add_all([
+        Client(name=f"Cliente {i}", email=f"c{i}@example.com", cpf=make_cpf(i + 1), phone="(11) 99999-9999", created_by=user.id)
+        for i in range(7)
+    ])
+    await db.commit()
+    shipped = (await db.scalars(select(Order.id).limit(3))).all()
+    await db.execute(Order.__table__.update().filter(Order.id.in_(shipped)).values(status=OrderStatus.SHIPPED))
+    await db.commit()
+    for table, model in (("orders", Order), ("products", Product), ("clients", Client)):
+        await spread_created_at(db, table, (await db.scalars(select(model.id).order_by(model.id))).all())
+
+LISTS = [
+    ("/orders/", {"status": "pending"}, 7),
+    ("/products/", {"category": "shirts"}, 10),
+    ("/clients/", {"name": "Cliente"}, 7),
+]
+
+@pytest.mark.parametrize("path,filters,expected", LISTS)
+async def test_cursor_walks_filtered_list_without_gaps_or_duplicates(
+    client, auth_headers, db, seed, user, make_cpf, path, filters, expected
+):
+    await seed_pages(db, seed, user, make_cpf)
+
+    ids = await follow_cursor(client, auth_headers, path, filters)
+
+    # Rows sharing created_at are split across pages by id
+    assert len(ids) == len(set(ids)) == expected
+    assert ids == await list_ids(client, auth_headers, path, filters)
+
+@pytest.mark.parametrize("path,filters,expected", LISTS)
+async def test_empty_cursor_returns_first_page(
+    client, auth_headers, db, seed, user, make_cpf, path, filters, expected
+):
+    await seed_pages(db, seed, user, make_cpf)
+
+    response = await client.get(path, headers=auth_headers, params={**filters, "cursor": "", "limit": 2})
+
+    assert [item["id"] for item in response.json()["items"]] == await list_ids(client, auth_headers, path, filters, 2)
+    assert response.json()["next_cursor"]
+
+@pytest.mark.parametrize("path", ["/orders/", "/products/", "/clients/"])
+@pytest.mark.parametrize("cursor", ["not a cursor", "bm90LWpzb24", "WzFd"])
+async def test_malformed_cursor_is_rejected(client, auth_headers, path, cursor):
+    response = await client.get(path, headers=auth_headers, params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+async def test_client_search_rejects_cursor(client, auth_headers, db, seed, user, make_cpf):
+    await seed_pages(db, seed, user, make_cpf)
+    page = (await client.get("/clients/", headers=auth_headers, params={"cursor": "", "limit": 2})).json()
+
+    response = await client.get("/clients/", headers=auth_headers, params={"q": "cliente", "cursor": page["next_cursor"]})
+
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+from app.core.cache import TTLCache
+from app.core.security import principal_cache
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = TTLCache("test", maxsize=2, ttl=10, timer=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    now[0] = 10.0
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (2, 2, 1, 1)
+    assert stats.hit_rate == 0.5
+
+async def test_repeat_requests_skip_the_users_query(client, auth_headers, count_queries):
+    await client.get("/clients/", headers=auth_headers)
+    count_queries.clear()
+    hits = principal_cache.stats().hits
+
+    await client.get("/clients/", headers=auth_headers)
+
+    assert not any("FROM users" in statement for statement in count_queries)
+    assert principal_cache.stats().hits == hits + 1
+
+async def test_user_update_evicts_cached_principal(client, auth_headers, user):
+    response = await client.put("/auth/users/me", headers=auth_headers, json={"is_active": False})
+    assert response.status_code == 200
+
+    response = await client.get("/clients/", headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
@@ -0,0 +1,53 @@
+from sqlalchemy import select
+
+from app.models.client import Client
+from app.models.product import Product
+
+async def test_conditional_get_returns_304_without_querying_products(client, auth_headers, seed, count_queries):
+    await seed(products=3)
+    first = await client.get("/products/", headers=auth_headers)
+    etag = first.headers["etag"]
+    count_queries.clear()
+
+    response = await client.get("/products/", headers={**auth_headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag and response.content == b""
+    # The principal is cached and the response comes from the product cache
+    assert count_queries == []
+
+    # A plain GET gets the cached body; other parameters are cached separately
+    response = await client.get("/products/", headers=auth_headers)
+    assert response.json() == first.json() and response.headers["etag"] == etag
+    response = await client.get("/products/", headers=auth_headers, params={"limit": 1})
+    assert len(response.json()) == 1 and response.headers["etag"] != etag
+
+async def test_product_update_invalidates_list_and_detail(client, auth_headers, seed):
+    await seed(products=2)
+    product_id = (await client.get("/products/", headers=auth_headers)).json()[0]["id"]
+    detail = await client.get(f"/products/{product_id}", headers=auth_headers)
+
+    await client.put(f"/products/{product_id}", headers=auth_headers, json={"price": 25.0})
+
+    response = await client.get(
+        f"/products/{product_id}", headers={**auth_headers, "If-None-Match": detail.headers["etag"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["price"] == 25.0
+    assert response.headers["etag"] != detail.headers["etag"]
+    assert (await client.get("/products/", headers=auth_headers)).json()[0]["price"] == 25.0
+
+async def test_order_stock_change_invalidates_cache(client, auth_headers, db, seed):
+    await seed(products=1)
+    product = await db.scalar(select(Product))
+    customer = await db.scalar(select(Client))
+    assert (await client.get(f"/products/{product.id}", headers=auth_headers)).json()["stock"] == 100
+
+    response = await client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"client_id": customer.id, "items": [{"product_id": product.id, "quantity": 3, "unit_price": 10.0}]},
+    )
+
+    assert response.status_code == 201
+    assert (await client.get(f"/products/{product.id}", headers=auth_headers)).json()["stock"] == 97
@@ -0,0 +1,63 @@
+import math
+
+from app.api.endpoints.orders import ITEM_BATCH_SIZE
+
+async def test_order_list_query_count_is_constant(client, auth_headers, seed, count_queries):
+    await seed(orders=100, items_per_order=3)
+    count_queries.clear()
+
+    response = await client.get("/orders/", headers=auth_headers, params={"limit": 100})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 100
+    assert all(len(order["items"]) == 3 for order in response.json())
+    # user lookup + orders + one IN query for every order's items
+    assert len(count_queries) == 3
+
+async def test_order_list_batches_item_queries(client, auth_headers, seed, count_queries):
+    orders = 2 * ITEM_BATCH_SIZE + 1
+    await seed(orders=orders, items_per_order=1)
+    count_queries.clear()
+
+    response = await client.get("/orders/", headers=auth_headers, params={"limit": orders})
+
+    assert all(len(order["items"]) == 1 for order in response.json())
+    # user lookup + orders + one items query per ITEM_BATCH_SIZE orders
+    item_queries = [statement for statement in count_queries if "FROM order_items" in statement]
+    assert len(item_queries) == math.ceil(orders / ITEM_BATCH_SIZE) == 3
+    assert len(count_queries) == 2 + len(item_queries)
+
+async def test_order_detail_loads_items_eagerly(client, auth_headers, seed, count_queries):
+    await seed(orders=1, items_per_order=5)
+    listing = await client.get("/orders/", headers=auth_headers)
+    count_queries.clear()
+
+    response = await client.get(f"/orders/{listing.json()[0]['id']}", headers=auth_headers)
+
+    assert len(response.json()["items"]) == 5
+    # order + items; the user principal is cached by the listing request
+    assert len(count_queries) == 2
+
+async def test_product_list_returns_images_without_n_plus_one(client, auth_headers, seed, count_queries):
+    await seed(products=50)
+    count_queries.clear()
+
+    response = await client.get("/products/", headers=auth_headers, params={"cursor": ""})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 50
+    assert all(product["images"][0]["is_primary"] for product in items)
+    # user lookup + products + selectin load of every product's images
+    assert len(count_queries) == 3
+
+async def test_section_filter_returns_each_order_once(client, auth_headers, seed, count_queries):
+    await seed(orders=3, items_per_order=3)
+    count_queries.clear()
+
+    response = await client.get("/orders/", headers=auth_headers, params={"section": "shirts"})
+
+    assert [len(order["items"]) for order in response.json()] == [3, 3, 3]
+    assert not any("DISTINCT" in statement for statement in count_queries)
+    response = await client.get("/orders/", headers=auth_headers, params={"section": "hats"})
+    assert response.json() == []
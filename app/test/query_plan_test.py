@@ -0,0 +1,109 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select, text
+
+from app.api.dependencies.pagination import encode_cursor, keyset_query, order_by_keyset
+from app.api.endpoints.clients import filter_clients
+from app.api.endpoints.orders import filter_orders
+from app.api.endpoints.products import filter_products
+from app.db.search import fuzzy_search
+from app.models.client import Client
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product, ProductImage
+from app.models.user import User
+
+LARGE_TABLES = {"orders", "order_items", "products", "product_images", "clients"}
+
+@pytest.fixture
+async def explain(engine, db):
+    """
+    Seed enough rows for the planner statistics to matter, then return a
+    function giving the tables a query reads in full.
+    """
+    def add_explain(conn, cursor, statement, parameters, context, executemany):
+        if context.execution_options.get("explain"):
+            prefix = "EXPLAIN " if conn.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+            statement = prefix + statement
+        return statement, parameters
+
+    await db.execute(User.__table__.insert(), [
+        {"id": name, "email": f"{name}@example.com", "username": name, "hashed_password": "-"}
+        for name in ("owner", "other")
+    ])
+    start = datetime(2026, 1, 1)
+    await db.execute(Product.__table__.insert(), [
+        {"id": f"p{i}", "description": f"Product {i}", "price": i % 300, "section": f"s{i % 20}", "stock": i % 5}
+        for i in range(2000)
+    ])
+    await db.execute(ProductImage.__table__.insert(), [
+        {"id": f"img{i}", "product_id": f"p{i}", "image_url": f"https://img/{i}.png"} for i in range(2000)
+    ])
+    await db.execute(Client.__table__.insert(), [
+        {
+            "id": f"c{i}", "name": f"Client {i}", "email": f"c{i}@example.com", "cpf": f"{i:011d}",
+            "cpf_normalized": f"{i:011d}", "phone": "-", "created_by": ("owner", "other")[i % 2],
+            "created_at": start + timedelta(hours=i),
+        }
+        for i in range(1000)
+    ])
+    await db.execute(Order.__table__.insert(), [
+        {
+            "id": f"o{i}", "client_id": f"c{i % 1000}", "total_amount": 10.0,
+            "status": list(OrderStatus)[i % 6].name, "created_at": start + timedelta(minutes=i),
+        }
+        for i in range(5000)
+    ])
+    await db.execute(OrderItem.__table__.insert(), [
+        {"id": f"i{i}", "order_id": f"o{i // 2}", "product_id": f"p{i % 2000}", "quantity": 1, "unit_price": 10.0, "total_price": 10.0}
+        for i in range(10000)
+    ])
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", add_explain, retval=True)
+
+    async def full_scans(query) -> set:
+        connection = await db.connection()
+        plan = [str(row[-1]) for row in await connection.execute(query.execution_options(explain=True))]
+        if connection.dialect.name == "postgresql":
+            tables = {line.split("Seq Scan on ")[1].split()[0] for line in plan if "Seq Scan on " in line}
+        else:
+            # SQLite: SEARCH uses an index to seek; SCAN reads the whole table or index
+            tables = {line.split()[1] for line in plan if line.startswith("SCAN ")}
+        return tables & LARGE_TABLES
+
+    yield full_scans
+    event.remove(engine.sync_engine, "before_cursor_execute", add_explain)
+
+def page(query, model):
+    return order_by_keyset(query, model).limit(100)
+
+ORDERS = select(Order)
+PRODUCTS = select(Product)
+CLIENTS = select(Client)
+OWNER = User(id="owner")
+
+QUERIES = {
+    "orders by status": lambda: page(filter_orders(ORDERS, status=OrderStatus.SHIPPED), Order),
+    "orders by client": lambda: page(filter_orders(ORDERS, client_id="c7"), Order),
+    "orders by date range": lambda: page(filter_orders(ORDERS, date(2026, 1, 2), date(2026, 1, 3)), Order),
+    "orders by section": lambda: page(filter_orders(ORDERS, section="s3"), Order),
+    "orders after cursor": lambda: keyset_query(
+        ORDERS, Order, encode_cursor(datetime(2026, 1, 3), "o10"), 100, "sqlite"
+    ),
+    "order items of a page": lambda: select(OrderItem).filter(OrderItem.order_id.in_(["o1", "o2"])),
+    "products by category": lambda: page(filter_products(PRODUCTS, category="s3"), Product),
+    "products by category and price": lambda: page(filter_products(PRODUCTS, "s3", 10, 20), Product),
+    "products by price range": lambda: page(filter_products(PRODUCTS, min_price=290, max_price=295), Product),
+    "images of a page": lambda: select(ProductImage).filter(ProductImage.product_id.in_(["p1", "p2"])),
+    "clients of a user": lambda: page(filter_clients(CLIENTS, OWNER), Client),
+    "clients by name": lambda: page(filter_clients(CLIENTS, OWNER, name="Client 1"), Client),
+    "client search": lambda: filter_clients(CLIENTS, OWNER).filter(
+        fuzzy_search("sqlite", [Client.name, Client.email], "client 12")[0]
+    ).limit(20),
+}
+
+@pytest.mark.parametrize("name", QUERIES)
+async def test_list_queries_use_indexes(explain, name):
+    assert await explain(QUERIES[name]()) == set()
@@ -0,0 +1,57 @@
+import logging
+
+from sqlalchemy import select
+
+from app.api.dependencies.database import track_queries
+from app.core.config import settings
+from app.models.client import Client
+from app.models.product import Product
+
+async def test_debug_mode_reports_query_count_and_time(client, auth_headers, seed, monkeypatch):
+    await seed(orders=10)
+    response = await client.get("/orders/", headers=auth_headers)
+    assert "x-db-query-count" not in response.headers
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    response = await client.get("/orders/", headers=auth_headers)
+
+    # orders + one IN query for their items; the principal is cached
+    assert response.headers["x-db-query-count"] == "2"
+    assert float(response.headers["x-db-time-ms"]) >= 0
+    assert response.headers["x-db-repeated-statements"] == "0"
+
+async def test_repeated_statements_are_flagged(db, seed):
+    await seed(products=6, items_per_order=0)
+    ids = (await db.scalars(select(Product.id))).all()
+
+    with track_queries() as stats:
+        for product_id in ids:
+            await db.scalar(select(Product).filter(Product.id == product_id))
+        await db.scalar(select(Client))
+
+    assert stats.count == 7
+    assert list(stats.repeated().values()) == [6]
+
+async def test_slow_queries_are_logged_without_parameter_values(db, seed, monkeypatch, caplog):
+    await seed()
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+
+    with caplog.at_level(logging.WARNING, "app.api.dependencies.database"):
+        await db.scalar(select(Client).filter(Client.cpf == "529.982.247-25"))
+
+    assert "Slow query" in caplog.text and "parameters=(str" in caplog.text
+    assert "529.982.247-25" not in caplog.text
+
+async def test_order_creation_query_budget(client, auth_headers, db, seed, max_queries):
+    await seed(products=5, items_per_order=0)
+    client_id = await db.scalar(select(Client.id))
+    product_ids = (await db.scalars(select(Product.id))).all()
+    await client.get("/orders/", headers=auth_headers)
+
+    # The query count must not grow with the number of items
+    with max_queries(6):
+        response = await client.post("/orders/", headers=auth_headers, json={
+            "client_id": client_id,
+            "items": [{"product_id": product_id, "quantity": 1, "unit_price": 10.0} for product_id in product_ids],
+        })
+    assert response.status_code == 201
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.models.client import Client
+from app.models.product import Product
+from app.models.sales_rollup import SalesRollup
+from app.services.sales import rebuild_sales_rollups
+
+async def rollup_rows(db):
+    db.expire_all()
+    rows = (await db.scalars(select(SalesRollup).filter(SalesRollup.order_count != 0))).all()
+    return sorted((row.day, row.section, row.status, row.order_count, row.total_amount) for row in rows)
+
+async def test_order_changes_keep_rollup_in_step_with_rebuild(client, auth_headers, db, seed):
+    await seed()
+    client_id = await db.scalar(select(Client.id))
+    shirt = await db.scalar(select(Product.id))
+    hat = Product(description="Hat", price=30.0, section="hats", stock=10)
+    db.add(hat)
+    await db.commit()
+
+    async def order(*items):
+        response = await client.post("/orders/", headers=auth_headers, json={
+            "client_id": client_id,
+            "items": [{"product_id": pid, "quantity": qty, "unit_price": price} for pid, qty, price in items],
+        })
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    first = await order((shirt, 2, 10.0), (hat.id, 1, 30.0))
+    second = await order((shirt, 1, 10.0))
+    third = await order((hat.id, 1, 30.0))
+    await client.put(f"/orders/{second}", headers=auth_headers, json={"status": "shipped"})
+    await client.delete(f"/orders/{third}", headers=auth_headers)
+
+    today = datetime.now(timezone.utc).date()
+    response = await client.get("/reports/sales", headers=auth_headers, params={"group_by": ["section", "status"]})
+    assert response.json() == [
+        {"section": "hats", "status": "pending", "orders": 1, "total_amount": 30.0},
+        {"section": "shirts", "status": "pending", "orders": 1, "total_amount": 20.0},
+        {"section": "shirts", "status": "shipped", "orders": 1, "total_amount": 10.0},
+    ]
+    response = await client.get(
+        "/reports/sales", headers=auth_headers, params={"group_by": "day", "start_date": today.isoformat()}
+    )
+    # The first order bought from two sections but is one order
+    assert response.json() == [{"day": today.isoformat(), "orders": 2, "total_amount": 60.0}]
+    response = await client.get("/reports/sales", headers=auth_headers, params={"group_by": "status"})
+    assert response.json() == [
+        {"status": "pending", "orders": 1, "total_amount": 50.0},
+        {"status": "shipped", "orders": 1, "total_amount": 10.0},
+    ]
+    response = await client.get("/reports/sales", headers=auth_headers, params={"group_by": "day", "section": "shirts"})
+    assert response.json() == [{"day": today.isoformat(), "orders": 2, "total_amount": 30.0}]
+
+    incremental = await rollup_rows(db)
+    assert await rebuild_sales_rollups(db) == 5
+    assert await rollup_rows(db) == incremental
+
+async def test_sales_report_rejects_unknown_grouping(client, auth_headers):
+    response = await client.get("/reports/sales", headers=auth_headers, params={"group_by": "client"})
+    assert response.status_code == 400
@@ -0,0 +1,60 @@
+from sqlalchemy import select
+
+from app.db.search import text_search
+from app.models.client import Client
+from app.models.product import Product
+
+async def test_product_search_ranks_prefix_matches_first(client, auth_headers, db):
+    db.add_all([
+        Product(description="Vestido de camisa listrada", price=90.0, section="dresses"),
+        Product(description="Camisa polo azul", price=50.0, section="shirts", stock=5),
+        Product(description="Calça jeans azul", price=120.0, section="pants"),
+        Product(description="100% algodão", price=20.0, section="basics"),
+    ])
+    await db.commit()
+
+    response = await client.get("/products/search", headers=auth_headers, params={"q": "camisa"})
+    assert [p["description"] for p in response.json()] == ["Camisa polo azul", "Vestido de camisa listrada"]
+
+    # Every term must match, and list filters still apply
+    response = await client.get("/products/search", headers=auth_headers, params={"q": "azul jeans"})
+    assert [p["section"] for p in response.json()] == ["pants"]
+    response = await client.get("/products/search", headers=auth_headers, params={"q": "azul", "available": True})
+    assert [p["section"] for p in response.json()] == ["shirts"]
+
+    # LIKE wildcards in the query are matched literally
+    response = await client.get("/products/search", headers=auth_headers, params={"q": "0%"})
+    assert [p["section"] for p in response.json()] == ["basics"]
+    response = await client.get("/products/search", headers=auth_headers, params={"q": "_"})
+    assert response.status_code == 422
+
+async def test_client_search_mode(client, auth_headers, db, user):
+    db.add_all([
+        Client(name="Mariana Souza", email="mari@example.com", cpf="529.982.247-25", phone="(11) 99999-9999", created_by=user.id),
+        Client(name="Ana Lima", email="ana.lima@example.com", cpf="111.444.777-35", phone="(11) 98765-4321", created_by=user.id),
+        Client(name="Ana Other", email="other@example.com", cpf="123.456.789-09", phone="(11) 91234-5678"),
+    ])
+    await db.commit()
+
+    response = await client.get("/clients/", headers=auth_headers, params={"q": "ana"})
+    # Own clients only, name prefix first
+    assert [c["name"] for c in response.json()] == ["Ana Lima", "Mariana Souza"]
+
+    response = await client.get("/clients/", headers=auth_headers, params={"q": "mari@"})
+    assert [c["name"] for c in response.json()] == ["Mariana Souza"]
+
+    response = await client.get("/clients/", headers=auth_headers, params={"q": "ana", "cursor": ""})
+    assert response.status_code == 400
+
+async def test_blank_search_query_is_rejected(client, auth_headers, db):
+    db.add(Product(description="Camisa polo azul", price=50.0, section="shirts"))
+    await db.commit()
+
+    response = await client.get("/products/search", headers=auth_headers, params={"q": "   "})
+    assert response.status_code == 422
+    response = await client.get("/clients/", headers=auth_headers, params={"q": "   "})
+    assert response.status_code == 422
+
+    # Without terms text_search matches nothing instead of failing
+    condition, rank = text_search("sqlite", Product.description, "   ")
+    assert (await db.scalars(select(Product.id).filter(condition).order_by(rank))).all() == []
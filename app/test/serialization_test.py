@@ -0,0 +1,54 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from app.api.dependencies.pagination import order_by_keyset
+from app.core.serialization import dumps
+from app.models.order import Order, OrderStatus
+from app.schemas.order import Order as OrderSchema
+from app.services.export import export_value, iter_export
+
+def validated_body(adapter, value) -> bytes:
+    """The body FastAPI sends after validating value against the response model."""
+    return JSONResponse(adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")).body
+
+async def test_order_list_matches_validated_response(client, auth_headers, db, seed):
+    await seed(orders=5, items_per_order=3)
+    await db.execute(update(Order).filter(Order.id == select(Order.id).limit(1).scalar_subquery()).values(
+        notes="Entrega às 10h, embrulhar 🎁", status=OrderStatus.SHIPPED, updated_at=datetime(2026, 3, 1, 9, 30, 0, 250000),
+    ))
+    await db.commit()
+    db.expire_all()
+    orders = (await db.scalars(order_by_keyset(select(Order).options(selectinload(Order.items)), Order))).all()
+    adapter = TypeAdapter(List[OrderSchema])
+
+    response = await client.get("/orders/", headers=auth_headers)
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == validated_body(adapter, orders)
+
+    response = await client.get("/orders/", headers=auth_headers, params={"cursor": "", "limit": 2})
+    assert response.json()["items"] == json.loads(validated_body(adapter, orders[:2]))
+    assert response.json()["next_cursor"]
+
+def test_dumps_writes_datetimes_like_pydantic():
+    adapter = TypeAdapter(List[datetime])
+    values = [datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 1, 1, 12, 0, 0, 5)]
+
+    assert dumps(values) == adapter.dump_json(values)
+
+async def test_ndjson_export_matches_exported_values(db, seed):
+    await seed(orders=3)
+    query = order_by_keyset(select(*Order.__table__.columns), Order)
+    expected = [
+        {column: export_value(value) for column, value in row._mapping.items()}
+        for row in await db.execute(query)
+    ]
+
+    body = "".join([chunk async for chunk in iter_export(db, query, "ndjson")])
+
+    assert [json.loads(line) for line in body.splitlines()] == expected
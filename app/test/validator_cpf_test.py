@@ -19,3 +19,17 @@ def test_cpf_invalid():
             cpf="111.111.111-11",  # cpf inválido
             phone="11999999999"
         )
+
+async def test_update_rejects_null_cpf(client, auth_headers, db, seed):
+    from sqlalchemy import select
+    from app.models.client import Client
+
+    await seed()
+    client_id = await db.scalar(select(Client.id))
+
+    response = await client.put(f"/clients/{client_id}", headers=auth_headers, json={"cpf": None})
+    assert response.status_code == 422
+
+    response = await client.put(f"/clients/{client_id}", headers=auth_headers, json={"city": None})
+    assert response.status_code == 200
+    assert response.json()["cpf"] == "529.982.247-25"
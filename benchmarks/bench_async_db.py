@@ -0,0 +1,117 @@
+"""
+Compare the sync ``Session`` and the ``AsyncSession`` database paths.
+
+Both routes run the same order listing query from inside an ``async def``
+handler, like the API endpoints do. The sync route uses ``get_db`` (the old
+pattern, which blocks the event loop for the duration of the query), the
+async route uses ``get_async_db``.
+
+Usage:
+    python -m benchmarks.bench_async_db --requests 500 --concurrency 50
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_async_db --sleep-ms 5
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, summarize, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=200, help="orders to seed")
+    parser.add_argument("--limit", type=int, default=50, help="page size per request")
+    parser.add_argument(
+        "--sleep-ms", type=float, default=0.0,
+        help="extra server-side latency per query (PostgreSQL pg_sleep only)",
+    )
+    return parser.parse_args()
+
+
+def seed(orders: int) -> None:
+    from app.api.dependencies.database import SessionLocal
+    from app.models.client import Client
+    from app.models.order import Order
+
+    with SessionLocal() as db:
+        client = Client(name="Bench", email="bench@example.com", cpf="000.000.001-91", phone="(11) 99999-9999")
+        db.add(client)
+        db.flush()
+        db.add_all(
+            Order(client_id=client.id, total_amount=10.0 * (i + 1)) for i in range(orders)
+        )
+        db.commit()
+
+
+def build_app(limit: int, sleep_ms: float):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select, text
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.api.dependencies.database import SessionLocal, get_async_db
+    from app.models.order import Order
+
+    sleep = text("SELECT pg_sleep(:s)") if sleep_ms else None
+    query = select(Order.id, Order.total_amount).limit(limit)
+    app = FastAPI()
+
+    # The sync session is scoped to the handler: with ``Depends(get_db)`` the
+    # connection is only released by a threadpool teardown that cannot run
+    # while the loop is blocked, so the pool deadlocks under concurrency.
+    @app.get("/sync")
+    async def sync_orders():
+        with SessionLocal() as db:
+            if sleep is not None:
+                db.execute(sleep, {"s": sleep_ms / 1000})
+            return [row.id for row in db.execute(query)]
+
+    @app.get("/async")
+    async def async_orders(db: AsyncSession = Depends(get_async_db)):
+        if sleep is not None:
+            await db.execute(sleep, {"s": sleep_ms / 1000})
+        return [row.id for row in await db.execute(query)]
+
+    return app
+
+
+async def drive(app, path: str, requests: int, concurrency: int):
+    import httpx
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        await client.get(path)  # warm up the pool
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return summarize(latencies, elapsed)
+
+
+def main():
+    args = parse_args()
+    url = use_database()
+    create_schema()
+    seed(args.orders)
+    app = build_app(args.limit, args.sleep_ms)
+
+    results = {"database": url.split("@")[-1], "concurrency": args.concurrency}
+    for path in ("/sync", "/async"):
+        results[path.strip("/")] = asyncio.run(drive(app, path, args.requests, args.concurrency))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
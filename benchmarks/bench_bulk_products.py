@@ -0,0 +1,99 @@
+"""
+Catalog sync throughput: per-SKU POST/PUT calls against the bulk upsert.
+
+The per-SKU path replays what the ERP sync does today (POST, or PUT for
+SKUs that already exist) for a sample of rows; the bulk path streams the
+whole catalog as CSV to ``POST /products/bulk``. Both report rows per second.
+
+Usage:
+    python -m benchmarks.bench_bulk_products --rows 50000 --sample 500
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_bulk_products --copy
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000, help="SKUs in the bulk file")
+    parser.add_argument("--sample", type=int, default=500, help="SKUs sent one request at a time")
+    parser.add_argument("--copy", action="store_true", help="use the PostgreSQL COPY path")
+    return parser.parse_args()
+
+
+def catalog_csv(rows: int, chunk_rows: int = 1000):
+    yield b"barcode,description,price,section,stock,is_active\n"
+    for start in range(0, rows, chunk_rows):
+        yield "".join(
+            f"{i:013d},Product {i},{10 + i % 90}.90,section-{i % 20},{i % 50},true\n"
+            for i in range(start, min(rows, start + chunk_rows))
+        ).encode()
+
+
+async def run(args):
+    import httpx
+
+    from app.core.security import get_current_active_user, get_current_admin_user
+    from app.main import app
+    from app.models.user import User
+
+    user = User(id="bench-user", email="bench@example.com", username="bench", is_admin=True)
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    app.dependency_overrides[get_current_admin_user] = lambda: user
+
+    results = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        ids = {}
+        start = time.perf_counter()
+        for i in range(args.sample):
+            product = {"description": f"Product {i}", "price": 10.9, "barcode": f"{i:013d}", "section": "bench"}
+            response = await client.post("/products/", json=product)
+            response.raise_for_status()
+            ids[i] = response.json()["id"]
+        for i in range(args.sample):
+            response = await client.put(f"/products/{ids[i]}", json={"price": 11.9, "stock": 3})
+            response.raise_for_status()
+        elapsed = time.perf_counter() - start
+        results["per_sku"] = {"requests": 2 * args.sample, "rows_per_second": round(2 * args.sample / elapsed, 2)}
+
+        async def body():
+            for chunk in catalog_csv(args.rows):
+                yield chunk
+
+        start = time.perf_counter()
+        response = await client.post(
+            "/products/bulk", params={"copy": args.copy}, headers={"Content-Type": "text/csv"}, content=body()
+        )
+        elapsed = time.perf_counter() - start
+        response.raise_for_status()
+        report = response.json()
+        results["bulk"] = {
+            "mode": "copy" if args.copy else "upsert",
+            "rows": args.rows,
+            "created": report["created"],
+            "updated": report["updated"],
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(args.rows / elapsed, 2),
+        }
+    return results
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    from app.api.dependencies.database import SessionLocal
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        db.add(User(id="bench-user", email="bench@example.com", username="bench", hashed_password="-", is_admin=True))
+        db.commit()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
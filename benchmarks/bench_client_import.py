@@ -0,0 +1,82 @@
+"""
+Client migration throughput: per-row POST /clients against the bulk import.
+
+Usage:
+    python -m benchmarks.bench_client_import --rows 100000 --sample 500
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, make_cpf, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000, help="clients in the import file")
+    parser.add_argument("--sample", type=int, default=500, help="clients sent one request at a time")
+    return parser.parse_args()
+
+
+def client_row(i: int) -> dict:
+    return {"name": f"Client {i}", "email": f"c{i}@example.com", "cpf": make_cpf(100000000 + i), "phone": "11987654321"}
+
+
+async def run(args):
+    import httpx
+
+    from app.core.security import get_current_active_user, get_current_admin_user
+    from app.main import app
+    from app.models.user import User
+
+    user = User(id="bench-user", email="bench@example.com", username="bench", is_admin=True)
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    app.dependency_overrides[get_current_admin_user] = lambda: user
+
+    results = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        for i in range(args.sample):
+            (await client.post("/clients/", json=client_row(i))).raise_for_status()
+        elapsed = time.perf_counter() - start
+        results["per_row"] = {"rows": args.sample, "rows_per_second": round(args.sample / elapsed, 2)}
+
+        async def body():
+            yield b"name,email,cpf,phone\n"
+            for start in range(0, args.rows, 1000):
+                yield "".join(
+                    "{name},{email},{cpf},{phone}\n".format(**client_row(i))
+                    for i in range(start, min(args.rows, start + 1000))
+                ).encode()
+
+        start = time.perf_counter()
+        response = await client.post(
+            "/clients/import", params={"errors_only": True}, headers={"Content-Type": "text/csv"}, content=body()
+        )
+        elapsed = time.perf_counter() - start
+        response.raise_for_status()
+        summary = json.loads(response.text.splitlines()[-1])["summary"]
+        results["import"] = {
+            **summary,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(args.rows / elapsed, 2),
+        }
+    return results
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    from app.api.dependencies.database import SessionLocal
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        db.add(User(id="bench-user", email="bench@example.com", username="bench", hashed_password="-", is_admin=True))
+        db.commit()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
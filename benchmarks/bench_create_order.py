@@ -0,0 +1,100 @@
+"""
+Database round trips and latency of ``POST /orders`` against basket size.
+
+Every SQL statement sent to the database during a request is counted
+(an executemany batch counts once), plus the COMMIT. The WhatsApp
+notification is only queued in the outbox table, inside the same transaction.
+
+Usage:
+    python -m benchmarks.bench_create_order --sizes 1 5 10 30 100 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, summarize, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 30, 100])
+    parser.add_argument("--repeat", type=int, default=20, help="orders per basket size")
+    return parser.parse_args()
+
+
+def seed(products: int):
+    from app.api.dependencies.database import SessionLocal
+    from app.models.client import Client
+    from app.models.product import Product
+    from app.models.user import User
+
+    with SessionLocal(expire_on_commit=False) as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="-", is_admin=True)
+        client = Client(name="Bench", email="bench@example.com", cpf="000.000.001-91", phone="(11) 99999-9999")
+        items = [
+            Product(description=f"Product {i}", price=10.0, section="bench", stock=10**9)
+            for i in range(products)
+        ]
+        db.add_all([user, client, *items])
+        db.commit()
+        return user, client.id, [product.id for product in items]
+
+
+async def run(sizes, repeat):
+    import httpx
+    from sqlalchemy import event
+
+    from app.api.dependencies.database import async_engine
+    from app.core.security import get_current_active_user
+    from app.main import app
+
+    user, client_id, product_ids = seed(max(sizes))
+
+    app.dependency_overrides[get_current_active_user] = lambda: user
+
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *a: statements.append(1))
+    event.listen(async_engine.sync_engine, "commit", lambda *a: statements.append(1))
+
+    results = []
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for size in sizes:
+            payload = {
+                "client_id": client_id,
+                "items": [
+                    {"product_id": product_id, "quantity": 1, "unit_price": 10.0}
+                    for product_id in product_ids[:size]
+                ],
+            }
+            await client.post("/orders/", json=payload)  # warm up
+
+            latencies, round_trips = [], []
+            start = time.perf_counter()
+            for _ in range(repeat):
+                statements.clear()
+                request_start = time.perf_counter()
+                response = await client.post("/orders/", json=payload)
+                latencies.append(time.perf_counter() - request_start)
+                response.raise_for_status()
+                round_trips.append(len(statements))
+            elapsed = time.perf_counter() - start
+
+            results.append({
+                "basket_size": size,
+                "round_trips": max(round_trips),
+                **summarize(latencies, elapsed),
+            })
+
+    return results
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    print(json.dumps(asyncio.run(run(args.sizes, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Full order history: paging through GET /orders against GET /orders/export.
+
+Reports wall time and peak Python memory (tracemalloc) of each way of
+reading every order. Paging materializes ORM objects and Pydantic models
+per page; the export streams rows from a server-side cursor.
+
+Usage:
+    python -m benchmarks.bench_export --orders 50000 --page-size 100
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import create_schema, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=100)
+    return parser.parse_args()
+
+
+def seed(orders: int):
+    from app.api.dependencies.database import SessionLocal
+    from app.models.client import Client
+    from app.models.order import Order
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        db.add(User(id="bench-user", email="bench@example.com", username="bench", hashed_password="-", is_admin=True))
+        db.add(Client(id="bench-client", name="Bench", email="c@example.com", cpf="000.000.001-91", phone="(11) 99999-9999"))
+        db.flush()
+        db.bulk_insert_mappings(
+            Order, [{"client_id": "bench-client", "total_amount": 10.0 + i % 7} for i in range(orders)]
+        )
+        db.commit()
+
+
+async def measure(read):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = await read()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": rows, "seconds": round(elapsed, 3), "peak_mib": round(peak / 2**20, 2)}
+
+
+async def run(args):
+    import httpx
+
+    from app.core.security import get_current_active_user
+    from app.main import app
+    from app.models.user import User
+
+    app.dependency_overrides[get_current_active_user] = lambda: User(id="bench-user", is_admin=True)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        async def paging():
+            rows = skip = 0
+            while True:
+                page = (await client.get("/orders/", params={"skip": skip, "limit": args.page_size})).json()
+                rows += len(page)
+                skip += args.page_size
+                if len(page) < args.page_size:
+                    return rows
+
+        async def export():
+            # Straight to the ASGI app: the httpx test transport buffers whole bodies
+            rows = 0
+
+            requested = False
+
+            async def receive():
+                nonlocal requested
+                if requested:
+                    await asyncio.Event().wait()  # the client never disconnects
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                nonlocal rows
+                if message["type"] == "http.response.body":
+                    rows += message.get("body", b"").count(b"\n")
+
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                "scheme": "http", "path": "/orders/export", "raw_path": b"/orders/export",
+                "query_string": b"", "root_path": "", "headers": [], "client": None, "server": None,
+            }
+            await app(scope, receive, send)
+            return rows
+
+        return {"paging": await measure(paging), "export": await measure(export)}
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    seed(args.orders)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+End-to-end HTTP load test of the API under a realistic request mix.
+
+Seeds the benchmark database, starts ``app.main:app`` with uvicorn in a
+subprocess and runs virtual users at each concurrency level. Every user
+loops over weighted actions (login, catalog browse, product search, client
+search, order create, order status update) until the level's time is up.
+Throughput and p50/p95/p99 latency are reported per route and written to a
+JSON file tagged with the git commit. ``--baseline`` compares the run with
+an earlier file.
+
+Usage:
+    python -m benchmarks.bench_load --concurrency 1 10 50 --duration 20
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_load --workers 4
+    python -m benchmarks.bench_load --mix browse --baseline benchmarks/results/load-1a2b3c4.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from benchmarks.common import create_schema, make_cpf, summarize, use_database
+
+PASSWORD = "Bench1234"
+SEARCH_TERMS = ["camisa", "vestido", "calça jeans", "azul", "bermuda"]
+CLIENT_TERMS = ["ana", "silva", "mariana", "souza", "lima"]
+
+# Relative weight of each action in a mix
+MIXES = {
+    "default": {
+        "login": 2, "list_products": 30, "read_product": 20, "search_products": 10,
+        "search_clients": 10, "create_order": 10, "update_order": 5, "list_orders": 13,
+    },
+    "browse": {"list_products": 50, "read_product": 30, "search_products": 20},
+    "checkout": {"read_product": 30, "search_clients": 20, "create_order": 35, "update_order": 15},
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50], help="virtual users per level")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the request mix")
+    parser.add_argument("--output", help="result file (default benchmarks/results/load-<commit>-<time>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    return parser.parse_args()
+
+
+def seed(args) -> Dict[str, List[str]]:
+    from app.api.dependencies.database import SessionLocal, engine
+    from app.core.security import get_password_hash
+    from app.models.client import Client
+    from app.models.order import Order, OrderItem
+    from app.models.product import Product
+    from app.models.user import User
+
+    words = ["Camisa", "Vestido", "Calça jeans", "Bermuda", "Blusa", "Saia"]
+    colors = ["azul", "preto", "branco", "vermelho", "verde"]
+    names = ["Ana", "Mariana", "João", "Pedro", "Juliana", "Lucas"]
+    surnames = ["Silva", "Souza", "Lima", "Costa", "Gomes"]
+
+    with SessionLocal() as db:
+        db.add(User(
+            id="bench-user", email="bench@example.com", username="bench",
+            hashed_password=get_password_hash(PASSWORD), is_admin=True,
+        ))
+        db.flush()
+        db.execute(Product.__table__.insert(), [
+            {
+                "id": f"p{i}", "description": f"{words[i % 6]} {colors[i // 6 % 5]} {i}",
+                "price": 20 + i % 180, "section": words[i % 6].split()[0].lower(), "stock": 10**9,
+                "created_by": "bench-user",
+            }
+            for i in range(args.products)
+        ])
+        db.execute(Client.__table__.insert(), [
+            {
+                "id": f"c{i}", "name": f"{names[i % 6]} {surnames[i // 6 % 5]} {i}",
+                "email": f"client{i}@example.com", "cpf": make_cpf(100000000 + i), "cpf_normalized": make_cpf(100000000 + i),
+                "phone": "11999999999", "created_by": "bench-user",
+            }
+            for i in range(args.clients)
+        ])
+        db.execute(Order.__table__.insert(), [
+            {"id": f"o{i}", "client_id": f"c{i % args.clients}", "total_amount": 20.0, "created_by": "bench-user"}
+            for i in range(args.orders)
+        ])
+        db.execute(OrderItem.__table__.insert(), [
+            {
+                "id": f"o{i}-i", "order_id": f"o{i}", "product_id": f"p{i % args.products}",
+                "quantity": 1, "unit_price": 20.0, "total_price": 20.0,
+            }
+            for i in range(args.orders)
+        ])
+        db.commit()
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+    return {
+        "products": [f"p{i}" for i in range(args.products)],
+        "clients": [f"c{i}" for i in range(args.clients)],
+        "orders": [f"o{i}" for i in range(args.orders)],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int) -> Tuple[subprocess.Popen, str]:
+    """Run the API in a subprocess against DATABASE_URL, without sending messages."""
+    port = free_port()
+    env = {**os.environ, "MESSAGING_PROVIDER": "fake", "FAKE_MESSAGING_LATENCY_SECONDS": "0"}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+    )
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def wait_ready(server: subprocess.Popen, client, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while True:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with code {server.returncode}")
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+        await asyncio.sleep(0.2)
+
+
+class VirtualUser:
+    """One client session that issues the actions of a mix, one at a time."""
+
+    def __init__(self, client, token: str, ids: Dict[str, List[str]], rng: random.Random):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.ids = ids
+        self.rng = rng
+
+    async def login(self):
+        return "POST /auth/login", await self.client.post(
+            "/auth/login", data={"email": "bench@example.com", "password": PASSWORD}
+        )
+
+    async def list_products(self):
+        params = {"limit": 20, "skip": self.rng.randrange(0, 200, 20)}
+        if self.rng.random() < 0.5:
+            params["category"] = self.rng.choice(["camisa", "vestido", "calça", "bermuda"])
+        return "GET /products/", await self.client.get("/products/", params=params, headers=self.headers)
+
+    async def read_product(self):
+        product_id = self.rng.choice(self.ids["products"])
+        return "GET /products/{id}", await self.client.get(f"/products/{product_id}", headers=self.headers)
+
+    async def search_products(self):
+        params = {"q": self.rng.choice(SEARCH_TERMS)}
+        return "GET /products/search", await self.client.get("/products/search", params=params, headers=self.headers)
+
+    async def search_clients(self):
+        params = {"q": self.rng.choice(CLIENT_TERMS), "limit": 20}
+        return "GET /clients/?q=", await self.client.get("/clients/", params=params, headers=self.headers)
+
+    async def list_orders(self):
+        params = {"limit": 20, "status": self.rng.choice(["pending", "confirmed", "shipped"])}
+        return "GET /orders/", await self.client.get("/orders/", params=params, headers=self.headers)
+
+    async def create_order(self):
+        items = [
+            {"product_id": product_id, "quantity": self.rng.randint(1, 3), "unit_price": 20.0}
+            for product_id in self.rng.sample(self.ids["products"], self.rng.randint(1, 4))
+        ]
+        response = await self.client.post(
+            "/orders/",
+            json={"client_id": self.rng.choice(self.ids["clients"]), "items": items},
+            headers=self.headers,
+        )
+        if response.status_code == 201:
+            self.ids["orders"].append(response.json()["id"])
+        return "POST /orders/", response
+
+    async def update_order(self):
+        order_id = self.rng.choice(self.ids["orders"])
+        status = self.rng.choice(["confirmed", "processing", "shipped", "delivered"])
+        return "PUT /orders/{id}", await self.client.put(
+            f"/orders/{order_id}", json={"status": status}, headers=self.headers
+        )
+
+
+async def run_level(base_url: str, token: str, ids, mix: Dict[str, int], users: int, duration: float, seed: int):
+    import httpx
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    actions, weights = zip(*mix.items())
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def user_loop(n: int):
+            user = VirtualUser(client, token, ids, random.Random(seed * 1000 + n))
+            while time.perf_counter() < deadline:
+                action = getattr(user, user.rng.choices(actions, weights)[0])
+                start = time.perf_counter()
+                try:
+                    route, response = await action()
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    route, failed = action.__name__, True
+                latencies[route].append(time.perf_counter() - start)
+                errors[route] += failed
+
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(user_loop(n) for n in range(users)))
+        elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "concurrency": users,
+        "seconds": round(elapsed, 3),
+        "requests": total,
+        "rps": round(total / elapsed, 2),
+        "errors": sum(errors.values()),
+        "routes": {
+            route: {**summarize(values, elapsed), "errors": errors[route]}
+            for route, values in sorted(latencies.items())
+        },
+    }
+
+
+async def run(args, ids):
+    import httpx
+
+    server, base_url = start_server(args.workers)
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            await wait_ready(server, client)
+            response = await client.post("/auth/login", data={"email": "bench@example.com", "password": PASSWORD})
+            response.raise_for_status()
+            token = response.json()["access_token"]
+
+        levels = []
+        for users in args.concurrency:
+            level = await run_level(base_url, token, ids, MIXES[args.mix], users, args.duration, args.seed)
+            print(f"concurrency {users}: {level['rps']} req/s, {level['errors']} errors", file=sys.stderr)
+            levels.append(level)
+        return levels
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"]).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def compare(baseline: dict, result: dict) -> List[dict]:
+    """Per level and route: throughput and p95 of the baseline against this run."""
+    old_levels = {level["concurrency"]: level for level in baseline["levels"]}
+    rows = []
+    for level in result["levels"]:
+        old = old_levels.get(level["concurrency"])
+        if not old:
+            continue
+        for route, stats in level["routes"].items():
+            before = old["routes"].get(route)
+            if not before:
+                continue
+            rows.append({
+                "concurrency": level["concurrency"],
+                "route": route,
+                "rps": f"{before['rps']} -> {stats['rps']}",
+                "p95_ms": f"{before['p95_ms']} -> {stats['p95_ms']}",
+                "p95_change_pct": round((stats["p95_ms"] / before["p95_ms"] - 1) * 100, 1) if before["p95_ms"] else None,
+            })
+    return rows
+
+
+def main():
+    args = parse_args()
+    database_url = use_database()
+    create_schema()
+    ids = seed(args)
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "database": database_url.split(":", 1)[0],
+        "mix": args.mix,
+        "weights": MIXES[args.mix],
+        "workers": args.workers,
+        "duration": args.duration,
+        "levels": asyncio.run(run(args, ids)),
+    }
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"load-{result['commit']}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(json.dumps(result["levels"], indent=2))
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline["mix"], baseline["database"], baseline["workers"]) != (args.mix, result["database"], args.workers):
+            print("warning: the baseline ran a different mix, database or worker count", file=sys.stderr)
+        print(json.dumps(compare(baseline, result), indent=2))
+    print(f"results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Login throughput under concurrency, and how much it stalls other requests.
+
+A burst of concurrent ``POST /auth/login`` calls runs while a probe keeps
+calling the health check. With bcrypt on the event loop (``--inline``) the
+probe waits behind every hash; with the hashing executor it stays fast.
+
+Usage:
+    python -m benchmarks.bench_login --logins 200 --concurrency 50
+    python -m benchmarks.bench_login --inline
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, summarize, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--inline", action="store_true",
+        help="verify passwords on the event loop, as before the executor was added",
+    )
+    return parser.parse_args()
+
+
+def seed():
+    from app.api.dependencies.database import SessionLocal
+    from app.core.security import get_password_hash
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        db.add(User(email="bench@example.com", username="bench", hashed_password=get_password_hash("Bench1234")))
+        db.commit()
+
+
+async def run(logins: int, concurrency: int, inline: bool):
+    import httpx
+
+    from app.api.endpoints import auth
+    from app.core.security import pwd_context
+    from app.main import app
+
+    if inline:
+        async def verify_inline(plain_password, hashed_password):
+            return pwd_context.verify_and_update(plain_password, hashed_password)
+
+        auth.verify_password_async = verify_inline
+
+    login_latencies, probe_latencies = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+    form = {"email": "bench@example.com", "password": "Bench1234"}
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        async def login():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/auth/login", data=form)
+                login_latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        async def probe(done: asyncio.Event):
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/")
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(done))
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    return {
+        "mode": "inline" if inline else "executor",
+        "login": summarize(login_latencies, elapsed),
+        "health_probe": summarize(probe_latencies, elapsed),
+    }
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    seed()
+    print(json.dumps(asyncio.run(run(args.logins, args.concurrency, args.inline)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Promotional broadcast throughput against the fake messaging provider.
+
+Runs one broadcast job per concurrency level through the broadcast worker,
+with the in-process fake provider standing in for Twilio, so the numbers
+show the worker's own overhead and how concurrency hides provider latency.
+
+Usage:
+    python -m benchmarks.bench_messaging --clients 2000 --latency 0.05 --concurrency 1 10 50
+    python -m benchmarks.bench_messaging --failure-rate 0.05 --rate 100
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake provider seconds per message")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--rate", type=float, default=0, help="messages per second cap, 0 for none")
+    return parser.parse_args()
+
+
+def seed(clients: int):
+    from app.api.dependencies.database import SessionLocal
+    from app.models.client import Client
+
+    with SessionLocal(expire_on_commit=False) as db:
+        rows = [
+            Client(name=f"Client {i}", email=f"c{i}@example.com", cpf=f"{i:011d}", phone=f"11{i:09d}")
+            for i in range(clients)
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [client.id for client in rows]
+
+
+def create_job(client_ids):
+    from app.api.dependencies.database import SessionLocal
+    from app.models.broadcast import BroadcastJob, BroadcastRecipient
+
+    with SessionLocal() as db:
+        job = BroadcastJob(message="Sale!", total=len(client_ids))
+        db.add(job)
+        db.flush()
+        db.add_all(BroadcastRecipient(job_id=job.id, client_id=client_id) for client_id in client_ids)
+        db.commit()
+        return job.id
+
+
+async def run(args):
+    from app.api.dependencies.database import AsyncSessionLocal
+    from app.models.broadcast import BroadcastJob
+    from app.services.broadcast import BroadcastWorker
+    from app.services.messaging import FakeProvider
+
+    client_ids = seed(args.clients)
+    results = []
+    for concurrency in args.concurrency:
+        job_id = create_job(client_ids)
+        provider = FakeProvider(latency=args.latency, failure_rate=args.failure_rate, seed=1)
+        worker = BroadcastWorker(AsyncSessionLocal, send=provider.send, concurrency=concurrency, rate=args.rate)
+
+        start = time.perf_counter()
+        await worker.run_once()
+        elapsed = time.perf_counter() - start
+
+        async with AsyncSessionLocal() as db:
+            job = await db.get(BroadcastJob, job_id)
+        results.append({
+            "concurrency": concurrency,
+            "sent": job.sent,
+            "failed": job.failed,
+            "seconds": round(elapsed, 3),
+            "messages_per_second": round(args.clients / elapsed, 2),
+        })
+    return results
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
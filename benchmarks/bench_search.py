@@ -0,0 +1,151 @@
+"""
+Product and client search: unindexed ILIKE scans against the ranked search.
+
+Seeds synthetic products and clients, then times the old substring filters
+(``ILIKE '%term%'``) and the queries behind ``GET /products/search`` and
+``GET /clients/?q=`` for a mix of common, rare and misspelled terms. On
+PostgreSQL the search uses the tsvector and trigram indexes, and the scan
+nodes of every plan are printed; elsewhere both sides scan.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_search --rows 1000000
+    python -m benchmarks.bench_search --rows 100000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, summarize, use_database
+
+ITEMS = ["Camisa", "Calça", "Vestido", "Saia", "Blusa", "Bermuda", "Jaqueta", "Casaco", "Short", "Macacão"]
+STYLES = ["polo", "jeans", "longo", "curto", "social", "casual", "estampado", "listrado", "de linho", "de malha"]
+COLORS = ["azul", "preto", "branco", "vermelho", "verde", "rosa", "bege", "cinza", "amarelo", "marinho"]
+FIRST_NAMES = ["Ana", "Maria", "João", "José", "Mariana", "Pedro", "Juliana", "Lucas", "Fernanda", "Rafael", "Beatriz", "Thiago"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa", "Almeida", "Ferreira", "Rodrigues", "Gomes"]
+
+PRODUCT_TERMS = ["camisa", "vestido longo", "jaqueta de linho vermelho", "calca jens", "macacao"]
+CLIENT_TERMS = ["mariana", "silva", "juliana.gomes", "fernana", "rafael rodrigues"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000, help="products and clients to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of each query")
+    parser.add_argument("--limit", type=int, default=20, help="results per query")
+    return parser.parse_args()
+
+
+def seed(rows: int, batch: int = 10000) -> None:
+    from app.api.dependencies.database import SessionLocal, engine
+    from app.models.client import Client
+    from app.models.product import Product
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        db.add(User(id="bench-user", email="bench@example.com", username="bench", hashed_password="-", is_admin=True))
+        db.flush()
+        for start in range(0, rows, batch):
+            numbers = range(start, min(rows, start + batch))
+            db.execute(Product.__table__.insert(), [
+                {
+                    "id": f"product-{i}",
+                    "description": f"{ITEMS[i % 10]} {STYLES[i // 10 % 10]} {COLORS[i // 100 % 10]} {i}",
+                    "price": 10 + i % 300,
+                    "section": ITEMS[i % 10].lower(),
+                    "stock": i % 40,
+                }
+                for i in numbers
+            ])
+            db.execute(Client.__table__.insert(), [
+                {
+                    "id": f"client-{i}",
+                    "name": f"{FIRST_NAMES[i % 12]} {LAST_NAMES[i // 12 % 11]} {i}",
+                    "email": f"{FIRST_NAMES[i % 12].lower()}.{LAST_NAMES[i // 12 % 11].lower()}{i}@example.com",
+                    "cpf": f"{i:011d}",
+                    "cpf_normalized": f"{i:011d}",
+                    "phone": "(11) 99999-9999",
+                    "created_by": "bench-user",
+                }
+                for i in numbers
+            ])
+        db.commit()
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE products")
+            connection.exec_driver_sql("ANALYZE clients")
+
+
+def queries(dialect: str, limit: int):
+    """(name, term, statement) for every query compared."""
+    from sqlalchemy import select
+
+    from app.db.search import fuzzy_search, icontains, text_search
+    from app.models.client import Client
+    from app.models.product import Product
+
+    for term in PRODUCT_TERMS:
+        yield "products_ilike", term, (
+            select(Product.id).filter(icontains(Product.description, term))
+            .order_by(Product.created_at, Product.id).limit(limit)
+        )
+        condition, rank = text_search(dialect, Product.description, term)
+        yield "products_search", term, (
+            select(Product.id).filter(condition)
+            .order_by(rank.desc(), Product.created_at, Product.id).limit(limit)
+        )
+    for term in CLIENT_TERMS:
+        yield "clients_ilike", term, (
+            select(Client.id).filter(Client.created_by == "bench-user")
+            .filter(icontains(Client.name, term) | icontains(Client.email, term))
+            .order_by(Client.created_at, Client.id).limit(limit)
+        )
+        condition, rank = fuzzy_search(dialect, [Client.name, Client.email], term)
+        yield "clients_search", term, (
+            select(Client.id).filter(Client.created_by == "bench-user").filter(condition)
+            .order_by(rank.desc(), Client.created_at, Client.id).limit(limit)
+        )
+
+
+async def explain(db, statement) -> list:
+    """Scan nodes of the PostgreSQL plan for a statement."""
+    connection = await db.connection()
+    sql = statement.compile(connection.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await connection.exec_driver_sql(f"EXPLAIN {sql}")).scalars()
+    return [line.strip() for line in plan if "Scan" in line]
+
+
+async def run(args):
+    from app.api.dependencies.database import AsyncSessionLocal, async_engine
+
+    dialect = async_engine.dialect.name
+    results = {}
+    async with AsyncSessionLocal() as db:
+        for name, term, statement in queries(dialect, args.limit):
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                found = len((await db.execute(statement)).all())
+                latencies.append(time.perf_counter() - start)
+            summary = summarize(latencies, sum(latencies))
+            results.setdefault(name, {})[term] = {
+                "found": found, "p50_ms": summary["p50_ms"], "p95_ms": summary["p95_ms"],
+            }
+            if dialect == "postgresql":
+                results[name][term]["plan"] = await explain(db, statement)
+    return results
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    start = time.perf_counter()
+    seed(args.rows)
+    print(f"seeded {args.rows} products and clients in {time.perf_counter() - start:.1f}s")
+    print(json.dumps(asyncio.run(run(args)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Section filter on orders: JOIN + DISTINCT against the IN semi-join.
+
+Seeds orders with many items each, then times a page of the order list
+filtered by section and the promotional broadcast's client query, written
+both ways. The join multiplies every order by its matching items before
+DISTINCT folds them back; the semi-join never produces duplicates.
+
+Usage:
+    python -m benchmarks.bench_section_filter --orders 20000 --items 20
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_section_filter --orders 200000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, summarize, use_database
+
+SECTIONS = 10
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--items", type=int, default=20, help="items per order")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20, help="runs of each query")
+    return parser.parse_args()
+
+
+def item_product(order: int, n: int) -> str:
+    # Most items of an order share its main section, as in a real basket
+    section = (order + n) % SECTIONS if n % 4 == 0 else order % SECTIONS
+    return f"p{section + SECTIONS * (n % 20)}"
+
+
+def seed(args, batch: int = 1000) -> None:
+    from app.api.dependencies.database import SessionLocal, engine
+    from app.models.client import Client
+    from app.models.order import Order, OrderItem
+    from app.models.product import Product
+
+    with SessionLocal() as db:
+        db.execute(Product.__table__.insert(), [
+            {"id": f"p{i}", "description": f"Product {i}", "price": 10.0, "section": f"section-{i % SECTIONS}"}
+            for i in range(SECTIONS * 20)
+        ])
+        db.execute(Client.__table__.insert(), [
+            {"id": f"c{i}", "name": f"Client {i}", "email": f"c{i}@example.com", "cpf": f"{i:011d}",
+             "cpf_normalized": f"{i:011d}", "phone": "11999999999", "is_active": True}
+            for i in range(args.clients)
+        ])
+        for start in range(0, args.orders, batch):
+            numbers = range(start, min(args.orders, start + batch))
+            db.execute(Order.__table__.insert(), [
+                {"id": f"o{i}", "client_id": f"c{i % args.clients}", "total_amount": 10.0 * args.items, "status": "PENDING"}
+                for i in numbers
+            ])
+            db.execute(OrderItem.__table__.insert(), [
+                {
+                    "id": f"o{i}-{n}", "order_id": f"o{i}", "product_id": item_product(i, n),
+                    "quantity": 1, "unit_price": 10.0, "total_price": 10.0,
+                }
+                for i in numbers for n in range(args.items)
+            ])
+        db.commit()
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+
+
+def queries(section: str):
+    from sqlalchemy import func, select
+
+    from app.api.dependencies.pagination import order_by_keyset
+    from app.models.client import Client
+    from app.models.order import Order, OrderItem, order_in_section
+    from app.models.product import Product
+
+    joined_orders = (
+        select(Order)
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .join(Product, OrderItem.product_id == Product.id)
+        .filter(Product.section == section)
+        .distinct()
+    )
+    joined_clients = (
+        select(Client.id).filter(Client.is_active == True)
+        .join(Order, Client.id == Order.client_id)
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .join(Product, OrderItem.product_id == Product.id)
+        .filter(Product.section == section)
+        .distinct()
+    )
+    semi_clients = select(Client.id).filter(
+        Client.is_active == True, Client.id.in_(select(Order.client_id).filter(order_in_section(section)))
+    )
+    yield "orders_page", "join_distinct", order_by_keyset(joined_orders, Order).limit(100)
+    yield "orders_page", "semi_join", order_by_keyset(select(Order).filter(order_in_section(section)), Order).limit(100)
+    yield "broadcast_clients", "join_distinct", select(func.count()).select_from(joined_clients.subquery())
+    yield "broadcast_clients", "semi_join", select(func.count()).select_from(semi_clients.subquery())
+
+
+async def run(args):
+    from app.api.dependencies.database import AsyncSessionLocal
+
+    results = {}
+    async with AsyncSessionLocal() as db:
+        for name, variant, statement in queries("section-3"):
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                rows = (await db.execute(statement)).all()
+                latencies.append(time.perf_counter() - start)
+            summary = summarize(latencies, sum(latencies))
+            results.setdefault(name, {})[variant] = {
+                "rows": rows[0][0] if name == "broadcast_clients" else len(rows),
+                "p50_ms": summary["p50_ms"],
+                "p95_ms": summary["p95_ms"],
+            }
+    return results
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    seed(args)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Order list serialization: ORM + Pydantic + json against column rows + orjson.
+
+Times one page of GET /orders built both ways, without HTTP: the old path
+loads ORM objects with selectinload, validates them into OrderSchema and
+renders the result with FastAPI's JSONResponse; the fast path selects
+column tuples and encodes plain dicts with orjson. Reports CPU time
+(process_time) and wall time per response, and checks both bodies match.
+
+Usage:
+    python -m benchmarks.bench_serialization --orders 2000 --items 5 --limit 100
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, use_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=5, help="items per order")
+    parser.add_argument("--limit", type=int, default=100, help="orders per response")
+    parser.add_argument("--repeat", type=int, default=50, help="responses built per variant")
+    return parser.parse_args()
+
+
+def seed(args) -> None:
+    from app.api.dependencies.database import SessionLocal
+    from app.models.client import Client
+    from app.models.order import Order, OrderItem
+    from app.models.product import Product
+
+    with SessionLocal() as db:
+        db.execute(Product.__table__.insert(), [
+            {"id": f"p{i}", "description": f"Product {i}", "price": 19.9, "section": "shirts"} for i in range(args.items)
+        ])
+        db.execute(Client.__table__.insert(), [{
+            "id": "c0", "name": "Bench", "email": "c@example.com", "cpf": "529.982.247-25",
+            "cpf_normalized": "52998224725", "phone": "(11) 99999-9999", "is_active": True,
+        }])
+        db.execute(Order.__table__.insert(), [
+            {"id": f"o{i}", "client_id": "c0", "total_amount": 19.9 * args.items, "status": "PENDING", "notes": "Entrega às 10h"}
+            for i in range(args.orders)
+        ])
+        db.execute(OrderItem.__table__.insert(), [
+            {"id": f"o{i}-{n}", "order_id": f"o{i}", "product_id": f"p{n}", "quantity": 1 + n, "unit_price": 19.9, "total_price": 19.9 * (1 + n)}
+            for i in range(args.orders) for n in range(args.items)
+        ])
+        db.commit()
+
+
+async def run(args):
+    from typing import List
+
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.api.dependencies.database import AsyncSessionLocal
+    from app.api.dependencies.pagination import order_by_keyset
+    from app.api.endpoints.orders import ORDER_FIELDS, order_rows
+    from app.core.serialization import dumps
+    from app.models.order import Order
+    from app.schemas.order import Order as OrderSchema
+
+    adapter = TypeAdapter(List[OrderSchema])
+
+    async def orm_pydantic(db) -> bytes:
+        query = order_by_keyset(select(Order).options(selectinload(Order.items)), Order).limit(args.limit)
+        orders = (await db.scalars(query)).all()
+        validated = adapter.validate_python(orders, from_attributes=True)
+        return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+    async def rows_orjson(db) -> bytes:
+        query = order_by_keyset(select(*ORDER_FIELDS), Order).limit(args.limit)
+        return dumps(await order_rows(db, (await db.execute(query)).all()))
+
+    results, bodies = {}, {}
+    for name, build in (("orm_pydantic", orm_pydantic), ("rows_orjson", rows_orjson)):
+        cpu = wall = 0.0
+        for _ in range(args.repeat):
+            # A fresh session per response, as per request, so no identity map reuse
+            async with AsyncSessionLocal() as db:
+                cpu_start, wall_start = time.process_time(), time.perf_counter()
+                bodies[name] = await build(db)
+                cpu += time.process_time() - cpu_start
+                wall += time.perf_counter() - wall_start
+        results[name] = {
+            "cpu_ms_per_response": round(cpu / args.repeat * 1000, 3),
+            "wall_ms_per_response": round(wall / args.repeat * 1000, 3),
+            "bytes": len(bodies[name]),
+        }
+    results["identical_bodies"] = bodies["orm_pydantic"] == bodies["rows_orjson"]
+    results["cpu_speedup"] = round(
+        results["orm_pydantic"]["cpu_ms_per_response"] / results["rows_orjson"]["cpu_ms_per_response"], 2
+    )
+    return results
+
+
+def main():
+    args = parse_args()
+    use_database()
+    create_schema()
+    seed(args)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks are run from the repository root as modules, e.g.
+``python -m benchmarks.bench_async_db``. They read DATABASE_URL like the API
+does; when it is not set they fall back to a throwaway SQLite file.
+"""
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+
+def use_database(url: str = None) -> str:
+    """
+    Point the app settings at the benchmark database.
+    Must run before any ``app.*`` module is imported.
+    """
+    if url is None:
+        url = os.environ.get("DATABASE_URL")
+    if not url:
+        path = os.path.join(tempfile.mkdtemp(prefix="lu_bench_"), "bench.db")
+        url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = url
+    return url
+
+
+def create_schema() -> None:
+    """Create every table on the benchmark database."""
+    from app.api.dependencies.database import Base, engine
+    import app.models.user  # noqa: F401
+    import app.models.client  # noqa: F401
+    import app.models.product  # noqa: F401
+    import app.models.order  # noqa: F401
+    import app.models.notification  # noqa: F401
+    import app.models.broadcast  # noqa: F401
+    import app.models.sales_rollup  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+
+
+def make_cpf(n: int) -> str:
+    """Valid CPF digits built from a nine-digit number."""
+    digits = [int(d) for d in f"{n:09d}"]
+    for size in (9, 10):
+        total = sum(d * (size + 1 - i) for i, d in enumerate(digits))
+        digits.append(total * 10 % 11 % 10)
+    return "".join(map(str, digits))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (milliseconds) for a run."""
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+class Timer:
+    """Context manager that records wall-clock time in ``elapsed``."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
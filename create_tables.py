@@ -3,6 +3,9 @@ from app.db.init_db import User
 from app.models.client import Client 
 from app.models.product import Product
 from app.models.order import Order
+from app.models.notification import NotificationOutbox
+from app.models.broadcast import BroadcastJob, BroadcastRecipient
+from app.models.sales_rollup import SalesRollup
 
 def main():
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,15 @@
+import asyncio
+
+from app.api.dependencies.database import AsyncSessionLocal
+from app.services.sales import rebuild_sales_rollups
+
+async def rebuild():
+    async with AsyncSessionLocal() as db:
+        return await rebuild_sales_rollups(db)
+
+def main():
+    rows = asyncio.run(rebuild())
+    print(f"Sales rollups rebuilt: {rows} rows")
+
+if __name__ == "__main__":
+    main()